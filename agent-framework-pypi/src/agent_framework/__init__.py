@@ -2,35 +2,40 @@
 #
 # This module provides the public API for the framework.
 # Import core components from here for application use.
+#
+# Public names are resolved lazily (PEP 562) so that `import agent_framework`
+# only pays for the submodules that are actually used.
 
-__version__ = "0.3.0"
-
-from agent_framework.base import (
-    BaseTool,
-    BasePlanner,
-    BaseMemory,
-    BasePromptManager,
-    BaseInferenceGateway,
-    BaseEventSubscriber,
-    BaseProgressHandler,
-    BaseMessageStore,
-    BaseJobStore,
-    Action,
-    FinalResponse,
-)
-
-from agent_framework.core.agent import Agent
-from agent_framework.core.manager_v2 import ManagerAgent
-from agent_framework.core.events import EventBus
+from __future__ import annotations
 
-from agent_framework.components.message_store_memory import (
-    MessageStoreMemory,
-    HierarchicalMessageStoreMemory,
-)
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
-from agent_framework.policies.presets import get_preset
+__version__ = "0.3.0"
 
-from agent_framework.decorators import tool, FunctionalTool
+if TYPE_CHECKING:
+    from agent_framework.base import (
+        BaseTool,
+        BasePlanner,
+        BaseMemory,
+        AsyncBaseMemory,
+        BasePromptManager,
+        BaseInferenceGateway,
+        BaseEventSubscriber,
+        BaseProgressHandler,
+        BaseMessageStore,
+        BaseJobStore,
+        Action,
+    )
+    from agent_framework.responses import FinalResponse
+    from agent_framework.core.agent import Agent
+    from agent_framework.core.manager_v2 import ManagerAgent
+    from agent_framework.core.events import EventBus
+    from agent_framework.components.message_store_memory import (
+        MessageStoreMemory,
+        HierarchicalMessageStoreMemory,
+    )
+    from agent_framework.policies.presets import get_preset
+    from agent_framework.decorators import tool, FunctionalTool
 
 # Public API
 __all__ = [
@@ -43,6 +48,7 @@ __all__ = [
     "BaseTool",
     "BasePlanner",
     "BaseMemory",
+    "AsyncBaseMemory",
     "BasePromptManager",
     "BaseInferenceGateway",
     "BaseEventSubscriber",
@@ -62,3 +68,53 @@ __all__ = [
     # Policies
     "get_preset",
 ]
+
+# Lazy attribute table: public name -> (module path, attribute name)
+_LAZY: Dict[str, Tuple[str, str]] = {
+    # Decorators
+    "tool": ("agent_framework.decorators", "tool"),
+    "FunctionalTool": ("agent_framework.decorators", "FunctionalTool"),
+    # Base Classes
+    "BaseTool": ("agent_framework.base", "BaseTool"),
+    "BasePlanner": ("agent_framework.base", "BasePlanner"),
+    "BaseMemory": ("agent_framework.base", "BaseMemory"),
+    "AsyncBaseMemory": ("agent_framework.base", "AsyncBaseMemory"),
+    "BasePromptManager": ("agent_framework.base", "BasePromptManager"),
+    "BaseInferenceGateway": ("agent_framework.base", "BaseInferenceGateway"),
+    "BaseEventSubscriber": ("agent_framework.base", "BaseEventSubscriber"),
+    "BaseProgressHandler": ("agent_framework.base", "BaseProgressHandler"),
+    "BaseMessageStore": ("agent_framework.base", "BaseMessageStore"),
+    "BaseJobStore": ("agent_framework.base", "BaseJobStore"),
+    "Action": ("agent_framework.base", "Action"),
+    "FinalResponse": ("agent_framework.responses", "FinalResponse"),
+    # Core Agents
+    "Agent": ("agent_framework.core.agent", "Agent"),
+    "ManagerAgent": ("agent_framework.core.manager_v2", "ManagerAgent"),
+    # Memory Implementations
+    "MessageStoreMemory": ("agent_framework.components.message_store_memory", "MessageStoreMemory"),
+    "HierarchicalMessageStoreMemory": (
+        "agent_framework.components.message_store_memory",
+        "HierarchicalMessageStoreMemory",
+    ),
+    # Events
+    "EventBus": ("agent_framework.core.events", "EventBus"),
+    # Policies
+    "get_preset": ("agent_framework.policies.presets", "get_preset"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve public names on first access and cache them in module globals."""
+    try:
+        module_path, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    import importlib
+
+    value = getattr(importlib.import_module(module_path), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,42 +1,37 @@
 from __future__ import annotations
 
+import functools
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Union, Type, Optional
-from pydantic import BaseModel, Field
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Dict, List, Union, Type, Optional
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+    from .responses import FinalResponse
 
 
 # Simple structured payloads used by planners and the agent loop
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Action:
     tool_name: str
     tool_args: Dict[str, Any] = field(default_factory=dict)
 
-
-class FinalResponse(BaseModel):
-    """
-    Represents a final, structured response to the user or application.
-    
-    This is returned when the agent has completed its task and needs to communicate
-    the result in a machine-readable format for frontend consumption.
-    """
-    operation: str = Field(
-        ..., 
-        description="The high-level operation the frontend should perform (e.g., 'display_message', 'update_file_tree', 'display_table', 'model_ops')."
-    )
-    payload: Dict[str, Any] = Field(
-        ..., 
-        description="A JSON object containing the data needed to execute the operation."
-    )
-    human_readable_summary: str = Field(
-        ..., 
-        description="A natural language summary of the result for display in a chat log."
-    )
+    def __post_init__(self) -> None:
+        # Tool names are used as dict keys by the dispatcher; interning makes
+        # those lookups hit the identity fast path.
+        if type(self.tool_name) is str:
+            object.__setattr__(self, "tool_name", sys.intern(self.tool_name))
 
 
 class BasePlanner(ABC):
+    # Empty so that planners declaring __slots__ get no per-instance __dict__
+    __slots__ = ()
+
     @abstractmethod
-    def plan(self, task_description: str, history: List[Dict[str, Any]]) -> Union[Action, List[Action], FinalResponse]:
+    def plan(self, task_description: str, history: List[Dict[str, Any]]) -> Union[Action, List[Action], "FinalResponse"]:
         """
         Plan the next step(s) for the agent.
         
@@ -48,6 +43,17 @@ class BasePlanner(ABC):
         raise NotImplementedError
 
 
+@functools.lru_cache(maxsize=256)
+def cached_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Return ``model.model_json_schema()``, generated once per model class.
+
+    Tool schemas are static per class, but pydantic rebuilds the JSON schema on
+    every call. The returned dict is shared between callers and must be treated
+    as read-only.
+    """
+    return model.model_json_schema()
+
+
 class BaseTool(ABC):
     @property
     @abstractmethod
@@ -71,12 +77,35 @@ class BaseTool(ABC):
         """Optional Pydantic model defining the tool's structured output schema."""
         raise NotImplementedError
 
+    def args_json_schema(self) -> Dict[str, Any]:
+        """JSON schema for ``args_schema``, cached per schema class (read-only)."""
+        return cached_json_schema(self.args_schema)
+
     @abstractmethod
     def execute(self, **kwargs) -> Any:
         raise NotImplementedError
 
 
 class BaseMemory(ABC):
+    """Synchronous memory interface used by Agent and ManagerAgent.
+
+    The agent loops call ``add`` and ``get_history`` directly on every step, so
+    implementations must not be coroutines. Memories that need to await I/O
+    should implement ``AsyncBaseMemory`` instead.
+    """
+
+    @abstractmethod
+    def add(self, message: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_history(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class AsyncBaseMemory(ABC):
+    """Async counterpart of ``BaseMemory`` for implementations that await I/O."""
+
     @abstractmethod
     async def add(self, message: Dict[str, Any]) -> None:
         raise NotImplementedError
@@ -231,3 +260,49 @@ class BaseMessageStore(ABC):
             List of message dicts from all specified agents, ordered chronologically
         """
         raise NotImplementedError
+    
+    def get_combined_messages(
+        self,
+        location: str,
+        *,
+        agent_key: str,
+        subordinate_keys: Optional[List[str]] = None,
+        include_global: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get the full history for an agent in a single call.
+        
+        Stores backed by a database or RPC service should override this to fetch
+        everything in one round trip (e.g. a single ``UNION ALL ... ORDER BY``).
+        The default implementation composes the individual getters.
+        
+        Args:
+            location: Location reference (e.g., job_id, namespace, or store path)
+            agent_key: Identifier for the agent whose history is requested
+            subordinate_keys: Optional agent keys whose messages are also included
+            include_global: Whether to append global messages
+            limit: Optional limit passed through to each underlying getter
+            
+        Returns:
+            Conversation messages, then agent messages, then subordinate messages
+            (if any), then global messages (if requested)
+        """
+        parts = [
+            self.get_conversation_messages(location, limit),
+            self.get_agent_messages(location, agent_key, limit),
+        ]
+        if subordinate_keys:
+            parts.append(self.get_team_messages(location, subordinate_keys, limit))
+        if include_global:
+            parts.append(self.get_global_messages(location, limit))
+        return list(chain.from_iterable(parts))
+
+
+def __getattr__(name: str) -> Any:
+    # FinalResponse lives in agent_framework.responses so that importing the
+    # ABCs does not pull in pydantic; keep the old import path working.
+    if name == "FinalResponse":
+        from .responses import FinalResponse
+
+        return FinalResponse
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
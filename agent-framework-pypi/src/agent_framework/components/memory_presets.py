@@ -15,12 +15,27 @@ Available presets:
 """
 from __future__ import annotations
 
+import functools
 import os
-from typing import Any, Dict, List, Optional, Callable
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Callable, Tuple
 
 from .memory import InMemoryMemory, SharedInMemoryMemory, HierarchicalSharedMemory
 
 
+# Shared read-only context for calls without one (factories only read it)
+_EMPTY_CONTEXT: Mapping[str, Any] = MappingProxyType({})
+
+# Single-pass replacement of "-" and " " with "_"
+_KEY_TRANSLATION = str.maketrans({"-": "_", " ": "_"})
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_key(key: str) -> str:
+    """Normalize an agent key to lowercase with underscores (memoized)."""
+    return key.lower().translate(_KEY_TRANSLATION)
+
+
 def _get_namespace(context: Dict[str, Any]) -> str:
     """Get namespace from context, falling back to 'default'."""
     # Try context first, then environment
@@ -38,7 +53,7 @@ def _get_agent_key(context: Dict[str, Any]) -> str:
     if not agent_key:
         agent_key = context.get("agent_name", "agent")
     # Normalize to lowercase with underscores
-    return agent_key.lower().replace("-", "_").replace(" ", "_")
+    return _normalize_key(agent_key)
 
 
 def _create_standalone(context: Dict[str, Any]) -> InMemoryMemory:
@@ -58,9 +73,8 @@ def _create_worker(context: Dict[str, Any]) -> SharedInMemoryMemory:
 
 def _create_manager(context: Dict[str, Any]) -> HierarchicalSharedMemory:
     """Create hierarchical memory for manager agents that sees subordinates."""
-    subordinates = context.get("subordinates", [])
     # Normalize subordinate keys
-    subordinates = [s.lower().replace("-", "_").replace(" ", "_") for s in subordinates]
+    subordinates = [_normalize_key(s) for s in context.get("subordinates", [])]
 
     return HierarchicalSharedMemory(
         namespace=_get_namespace(context),
@@ -69,12 +83,28 @@ def _create_manager(context: Dict[str, Any]) -> HierarchicalSharedMemory:
     )
 
 
-# Preset registry: name -> factory function
-MEMORY_PRESETS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+# Preset registry: name -> factory function. Exposed read-only; use
+# register_preset() to add or replace entries.
+_MEMORY_PRESETS_RAW: Dict[str, Callable[[Dict[str, Any]], Any]] = {
     "standalone": _create_standalone,
     "worker": _create_worker,
     "manager": _create_manager,
 }
+MEMORY_PRESETS: Mapping[str, Callable[[Dict[str, Any]], Any]] = MappingProxyType(_MEMORY_PRESETS_RAW)
+
+@functools.lru_cache(maxsize=256)
+def _get_cached_preset(
+    factory: Callable[[Dict[str, Any]], Any],
+    namespace: str,
+    agent_key: str,
+    subordinates: Tuple[str, ...],
+) -> Any:
+    """Build (once) the memory instance for a fully resolved shared-view context."""
+    return factory({
+        "namespace": namespace,
+        "agent_key": agent_key,
+        "subordinates": list(subordinates),
+    })
 
 
 def get_memory_preset(preset_name: str, context: Optional[Dict[str, Any]] = None) -> Any:
@@ -89,7 +119,10 @@ def get_memory_preset(preset_name: str, context: Optional[Dict[str, Any]] = None
             - subordinates: List of subordinate agent names (for manager preset)
 
     Returns:
-        Memory instance configured according to the preset
+        Memory instance configured according to the preset. The built-in
+        worker and manager factories return the same instance for identical
+        resolved contexts; standalone and registered factories are called
+        with the full context on every lookup.
 
     Raises:
         ValueError: If preset_name is not recognized
@@ -101,12 +134,25 @@ def get_memory_preset(preset_name: str, context: Optional[Dict[str, Any]] = None
         ...     "subordinates": ["research-worker", "task-worker"]
         ... })
     """
-    if preset_name not in MEMORY_PRESETS:
+    factory = MEMORY_PRESETS.get(preset_name)
+    if factory is None:
         available = list(MEMORY_PRESETS.keys())
         raise ValueError(f"Unknown memory preset: '{preset_name}'. Available: {available}")
 
-    context = context or {}
-    factory = MEMORY_PRESETS[preset_name]
+    context = context or _EMPTY_CONTEXT
+    # The built-in worker/manager memories are stateless views over the shared
+    # state store and only read namespace, agent_key and subordinates, so
+    # identical resolved contexts share one instance. Matched by identity: a
+    # factory registered in their place gets the full context and is not cached.
+    # Standalone is never cached because every call needs a fresh history.
+    if factory is _create_worker or factory is _create_manager:
+        subordinates = tuple(_normalize_key(s) for s in context.get("subordinates", ()))
+        return _get_cached_preset(
+            factory,
+            _get_namespace(context),
+            _get_agent_key(context),
+            subordinates,
+        )
     return factory(context)
 
 
@@ -116,13 +162,32 @@ def list_memory_presets() -> List[str]:
 
 
 # Preset descriptions for documentation/help
-PRESET_DESCRIPTIONS = {
+_PRESET_DESCRIPTIONS_RAW: Dict[str, str] = {
     "standalone": "Isolated memory for single agents. Each agent has private history.",
     "worker": "Shared memory for worker agents. Sees own messages + global updates.",
     "manager": "Hierarchical memory for managers. Sees own + subordinate messages + global updates.",
 }
+PRESET_DESCRIPTIONS: Mapping[str, str] = MappingProxyType(_PRESET_DESCRIPTIONS_RAW)
 
 
 def describe_preset(preset_name: str) -> str:
     """Get description for a preset."""
     return PRESET_DESCRIPTIONS.get(preset_name, "No description available.")
+
+
+def register_preset(
+    preset_name: str,
+    factory: Callable[[Dict[str, Any]], Any],
+    description: Optional[str] = None,
+) -> None:
+    """Register (or replace) a memory preset.
+
+    Registered factories are called with the caller's full context on every
+    lookup, including when they replace "worker" or "manager"; only the
+    built-in factories share instances. Cached instances are dropped so a
+    restored built-in factory starts from a clean cache.
+    """
+    _MEMORY_PRESETS_RAW[preset_name] = factory
+    if description is not None:
+        _PRESET_DESCRIPTIONS_RAW[preset_name] = description
+    _get_cached_preset.cache_clear()
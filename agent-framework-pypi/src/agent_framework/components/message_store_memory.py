@@ -4,10 +4,11 @@ Memory implementation that reads from a message store.
 This allows implementations to prepare message stores in their preferred format
 and the framework reads messages directly from the store.
 """
+# mypy: strict_optional=True
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
 from ..base import BaseMemory, BaseMessageStore
 
@@ -19,11 +20,26 @@ class MessageStoreMemory(BaseMemory):
     The framework reads messages directly from the store.
     """
     
+    _message_store: BaseMessageStore
+    _location: str
+    _agent_key: str
+    _get_conversation: Callable[..., Iterable[Dict[str, Any]]]
+    _get_agent: Callable[..., Iterable[Dict[str, Any]]]
+    _get_global: Callable[..., Iterable[Dict[str, Any]]]
+    _get_combined: Optional[Callable[..., List[Dict[str, Any]]]]
+    _conversation_limit: Optional[int]
+    _agent_limit: Optional[int]
+    _global_limit: Optional[int]
+    _combined_limit: Optional[int]
+    
     def __init__(
         self,
         message_store: BaseMessageStore,
         location: str,
         agent_key: str,
+        conversation_limit: Optional[int] = None,
+        agent_limit: Optional[int] = None,
+        global_limit: Optional[int] = None,
     ) -> None:
         """Initialize memory backed by a message store.
         
@@ -31,12 +47,33 @@ class MessageStoreMemory(BaseMemory):
             message_store: The message store implementation to read from
             location: Location reference (e.g., job_id, namespace, or store path)
             agent_key: Identifier for this agent (e.g., "orchestrator", "worker-1")
+            conversation_limit: Optional limit passed to get_conversation_messages
+            agent_limit: Optional limit passed to get_agent_messages
+            global_limit: Optional limit passed to get_global_messages
         """
-        if not message_store or not location or not agent_key:
+        if message_store is None or not location or not agent_key:
             raise ValueError("message_store, location, and agent_key are required")
         self._message_store = message_store
         self._location = location
         self._agent_key = agent_key
+        # Store methods are resolved once; get_history runs on every agent step
+        self._get_conversation = message_store.get_conversation_messages
+        self._get_agent = message_store.get_agent_messages
+        self._get_global = message_store.get_global_messages
+        self._get_combined = getattr(message_store, "get_combined_messages", None)
+        self._conversation_limit = conversation_limit
+        self._agent_limit = agent_limit
+        self._global_limit = global_limit
+        self._resolve_combined_limit(conversation_limit, agent_limit, global_limit)
+    
+    def _resolve_combined_limit(self, *limits: Optional[int]) -> None:
+        # get_combined_messages takes a single limit; when the per-segment limits
+        # differ, fall back to the per-getter path so each one is honoured.
+        if len(set(limits)) == 1:
+            self._combined_limit = limits[0]
+        else:
+            self._combined_limit = None
+            self._get_combined = None
     
     def add(self, message: Dict[str, Any]) -> None:
         """Add a message to the store.
@@ -58,36 +95,53 @@ class MessageStoreMemory(BaseMemory):
         1. Conversation messages (user_message, assistant_message)
         2. Agent execution traces (task, action, observation, etc.)
         3. Global messages (global_observation, synthesis, etc.)
+        
+        Uses the store's ``get_combined_messages`` when available so the whole
+        history is fetched in one round trip.
         """
-        history = []
+        if self._get_combined is not None:
+            return self._get_combined(
+                self._location,
+                agent_key=self._agent_key,
+                limit=self._combined_limit,
+            )
         
-        # Get conversation messages
-        conversation = self._message_store.get_conversation_messages(self._location)
-        history.extend(conversation)
+        return list(self.iter_history())
+    
+    def iter_history(self) -> Iterator[Dict[str, Any]]:
+        """Yield history lazily in the same order as ``get_history``.
         
-        # Get agent-specific execution traces
-        agent_msgs = self._message_store.get_agent_messages(
-            self._location,
-            self._agent_key
-        )
-        history.extend(agent_msgs)
+        Each store getter is only called once the previous segment has been
+        consumed, so callers that stop early (e.g. on a token budget) skip
+        the remaining reads.
+        """
+        # Conversation messages
+        yield from self._get_conversation(self._location, limit=self._conversation_limit)
         
-        # Get global messages
-        global_msgs = self._message_store.get_global_messages(self._location)
-        history.extend(global_msgs)
+        # Agent-specific execution traces
+        yield from self._get_agent(self._location, self._agent_key, limit=self._agent_limit)
         
-        return history
+        # Global messages
+        yield from self._get_global(self._location, limit=self._global_limit)
 
 
 class HierarchicalMessageStoreMemory(MessageStoreMemory):
     """Memory for managers that can see subordinate agent messages."""
     
+    _subordinates: List[str]
+    _get_team: Optional[Callable[..., Iterable[Dict[str, Any]]]]
+    _team_limit: Optional[int]
+    
     def __init__(
         self,
         message_store: BaseMessageStore,
         location: str,
         agent_key: str,
         subordinates: Optional[List[str]] = None,
+        conversation_limit: Optional[int] = None,
+        agent_limit: Optional[int] = None,
+        global_limit: Optional[int] = None,
+        team_limit: Optional[int] = None,
     ) -> None:
         """Initialize hierarchical memory backed by a message store.
         
@@ -96,36 +150,56 @@ class HierarchicalMessageStoreMemory(MessageStoreMemory):
             location: Location reference (e.g., job_id, namespace, or store path)
             agent_key: Identifier for this manager agent
             subordinates: List of subordinate agent keys this manager can see
+            conversation_limit: Optional limit passed to get_conversation_messages
+            agent_limit: Optional limit passed to get_agent_messages
+            global_limit: Optional limit passed to get_global_messages
+            team_limit: Optional per-agent limit passed to get_team_messages
         """
-        super().__init__(message_store, location, agent_key)
+        super().__init__(
+            message_store,
+            location,
+            agent_key,
+            conversation_limit=conversation_limit,
+            agent_limit=agent_limit,
+            global_limit=global_limit,
+        )
         self._subordinates = subordinates or []
+        self._team_limit = team_limit
+        # Team reads only happen with subordinates; stores without team support
+        # stay usable for managers that have none
+        self._get_team = None
+        if self._subordinates:
+            self._get_team = message_store.get_team_messages
+            self._resolve_combined_limit(
+                conversation_limit, agent_limit, global_limit, team_limit
+            )
     
     def get_history(self) -> List[Dict[str, Any]]:
         """Get history including subordinate agent messages."""
-        history = []
-        
-        # Get conversation messages
-        conversation = self._message_store.get_conversation_messages(self._location)
-        history.extend(conversation)
-        
-        # Get manager's own messages
-        manager_msgs = self._message_store.get_agent_messages(
-            self._location,
-            self._agent_key
-        )
-        history.extend(manager_msgs)
-        
-        # Get subordinate messages
-        if self._subordinates:
-            team_msgs = self._message_store.get_team_messages(
+        if not self._subordinates:
+            # Without subordinates this reads exactly what the base class reads
+            return super().get_history()
+        if self._get_combined is not None:
+            return self._get_combined(
                 self._location,
-                self._subordinates
+                agent_key=self._agent_key,
+                subordinate_keys=self._subordinates,
+                limit=self._combined_limit,
             )
-            history.extend(team_msgs)
         
-        # Get global messages
-        global_msgs = self._message_store.get_global_messages(self._location)
-        history.extend(global_msgs)
+        return list(self.iter_history())
+    
+    def iter_history(self) -> Iterator[Dict[str, Any]]:
+        """Yield history lazily, including subordinate agent messages."""
+        # Conversation messages
+        yield from self._get_conversation(self._location, limit=self._conversation_limit)
         
-        return history
-
+        # Manager's own messages
+        yield from self._get_agent(self._location, self._agent_key, limit=self._agent_limit)
+        
+        # Subordinate messages
+        if self._get_team is not None:
+            yield from self._get_team(self._location, self._subordinates, limit=self._team_limit)
+        
+        # Global messages
+        yield from self._get_global(self._location, limit=self._global_limit)
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Union, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Sequence, Set, Union, Optional, Tuple
+import asyncio
+import functools
+import hashlib
 import json
 import os
 import re
 import logging
+import threading
+from collections import OrderedDict
+from io import StringIO
 
-from ..base import Action, FinalResponse, BasePlanner
-from ..base import BaseInferenceGateway
+from ..base import Action, BasePlanner
+from ..responses import FinalResponse
+from ..base import BaseInferenceGateway, cached_json_schema
 from ..logging import get_logger
-import logging
 from ..services.request_context import get_from_context
 from ..models.script import ScriptPlan
 from ..constants import (
@@ -22,9 +28,502 @@ from ..constants import (
     OBSERVATION,
     GLOBAL_OBSERVATION,
 )
-from ..policies.history_filters import OrchestratorHistoryFilter
+from ..policies.history_filters import (
+    ManagerHistoryFilter,
+    OrchestratorHistoryFilter,
+    WorkerHistoryFilter,
+)
 from ..policies.base import HistoryFilter
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
+
+try:  # Optional faster JSON codec (pip install auto-ai-agent-framework[speedups])
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on environment
+    _orjson = None
+
+
+_TRUTHY = frozenset({"1", "true", "yes"})
+
+# Shared validator for manager scripts; built once instead of per parse
+_SCRIPT_PLAN_ADAPTER: TypeAdapter[ScriptPlan] = TypeAdapter(ScriptPlan)
+
+
+@functools.lru_cache(maxsize=None)
+def _env_flag(name: str, default: bool) -> bool:
+    """Boolean env flag, parsed once per process."""
+    val = os.getenv(name)
+    if val is None:
+        return default
+    return val.lower() in _TRUTHY
+
+
+@functools.lru_cache(maxsize=None)
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    """Integer env setting, parsed once per process; blank or invalid values use the default."""
+    val = os.getenv(name)
+    if val is None or val.strip() == "":
+        return default
+    try:
+        return int(val.strip())
+    except ValueError:
+        return default
+
+
+@functools.lru_cache(maxsize=None)
+def _planner_logger() -> logging.Logger:
+    return get_logger()
+
+
+class _ResponseCache:
+    """Per-planner exact-match LRU of LLM responses, keyed by a prompt digest.
+
+    Scoped to one planner instance so responses never leak between planners
+    (and therefore between tenants that own separate planners).
+    """
+
+    __slots__ = ("_entries", "_maxsize", "_lock")
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self._entries: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(prompt: Any) -> bytes:
+        encoded = json.dumps(prompt, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).digest()
+
+    def invoke(self, llm: Any, prompt: Any) -> Any:
+        key = self._key(prompt)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        response = llm.invoke(prompt)
+        with self._lock:
+            self._entries[key] = response
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return response
+
+
+class _EntryRenderCache:
+    """Renderings of the history window from the previous prompt build.
+
+    Keyed by history entry identity: entries are not modified once appended, so
+    ReActPlanner renders each one once instead of on every iteration. Only the
+    entries rendered into the latest prompt are kept (``keep``), so the cache
+    never outlives the window the memory is still showing. The entry is stored
+    next to its rendering, which keeps its id() from being reused while cached.
+    """
+
+    __slots__ = ("_entries", "_lock")
+
+    def __init__(self) -> None:
+        self._entries: Dict[int, Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Dict[int, Tuple[Any, Any]]:
+        """The renderings kept by the last ``keep`` call (not to be mutated)."""
+        with self._lock:
+            return self._entries
+
+    def keep(self, entries: Dict[int, Tuple[Any, Any]]) -> None:
+        """Replace the cached renderings with those of the window just built."""
+        with self._lock:
+            self._entries = entries
+
+
+def _make_response_cache() -> Optional[_ResponseCache]:
+    """Return a response cache when AGENT_PLAN_CACHE_ENABLED is set, else None."""
+    if not _env_flag("AGENT_PLAN_CACHE_ENABLED", False):
+        return None
+    return _ResponseCache(_env_int("AGENT_PLAN_CACHE_SIZE", 256) or 256)
+
+
+def _invoke_llm(llm: Any, cache: Optional[_ResponseCache], prompt: Any) -> Any:
+    if cache is None:
+        return llm.invoke(prompt)
+    return cache.invoke(llm, prompt)
+
+
+# Fixed pieces of the ReAct text prompt
+_REACT_TOOLS_HEADER = "\n\nAvailable tools:\n"
+_REACT_QUESTION = "\n\nWhat should I do next? (Return JSON with thought/action/args or thought/final_answer)"
+
+_UNABLE_TO_PLAN = "Unable to determine next action."
+# Fixed part of the hint returned to the model after malformed JSON
+_PARSE_ERROR_ADVICE = (
+    "\nIMPORTANT: When using python_interpreter with complex code:\n"
+    "1. Keep code simple and on fewer lines\n"
+    "2. Avoid nested quotes in JSON\n"
+    "3. Use simpler variable names\n"
+    "4. Or use final_answer to return results directly\n"
+    "Please try again with simpler formatting."
+)
+
+
+def _unable_to_plan_response() -> FinalResponse:
+    """Fallback when the LLM output yields neither an action nor an answer.
+
+    Built per call rather than shared: callers may mutate the payload in place.
+    """
+    return FinalResponse.trusted(
+        operation="display_message",
+        payload={"message": _UNABLE_TO_PLAN, "error": True},
+        human_readable_summary=_UNABLE_TO_PLAN,
+    )
+
+
+def _parse_error_response(error_msg: str) -> FinalResponse:
+    """Response asking the model to retry after it returned malformed JSON."""
+    return FinalResponse.trusted(
+        operation="display_message",
+        payload={
+            "message": f"⚠️ JSON PARSE ERROR: Your previous response had malformed JSON: {error_msg}{_PARSE_ERROR_ADVICE}",
+            "error": True,
+            "parse_error": True,
+            "hint": "Retry with simpler code formatting",
+        },
+        human_readable_summary="JSON parse error - need to retry with simpler formatting",
+    )
+
+
+# Placeholder model_dir values that LLMs echo back from tool specs
+_MODEL_DIR_PLACEHOLDERS = frozenset({"model_dir", "<model_dir>", "${model_dir}", "${MODEL_DIR}"})
+
+# Precompiled patterns shared by the planners below
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{)")
+# Characters that can change brace depth or string state while scanning JSON
+_JSON_STRUCTURAL_RE = re.compile(r'[{}"\\]')
+_REL_ID_RE = re.compile(r"(id|rel(ationship)?\s*id)\s*[:=\s]*([a-z0-9]+)")
+_TABLE_COL_RE = re.compile(r"'([^']+)'\s*\[([^\]]+)\]")
+_NUMBER_RE = re.compile(r"\b\d+(?:[\.\d]*)?\b")
+# MathPlanner signals; plain substring matches, like the `in` checks they replace
+_CALC_OPERATOR_RE = re.compile(r"[-+*×x/÷%^]")
+_DIGIT_RE = re.compile(r"\d")
+_CALC_KEYWORD_RE = re.compile("|".join(map(re.escape, (
+    "plus", "minus", "times", "multiplied by", "divided by", "over", "mod", "modulo",
+    "remainder", "percent of", "% of", "power of", "raised to", "squared", "cubed",
+    "sqrt", "square root", "log", "ln", "sin", "cos", "tan", "calculate", "compute", "evaluate",
+))))
+_CALC_QUERY_RE = re.compile(r"what is|what's|solve")
+
+
+# History entry type -> chat role for conversation turns
+_CONVERSATION_ROLE_FOR_TYPE: Dict[str, str] = {
+    USER_MESSAGE: "user",
+    ASSISTANT_MESSAGE: "assistant",
+}
+# ChatPlanner also maps the legacy task/final entry types
+_CHAT_ROLE_FOR_TYPE: Dict[str, str] = {
+    **_CONVERSATION_ROLE_FOR_TYPE,
+    TASK: "user",
+    FINAL: "assistant",
+}
+
+_JSON_DECODER = json.JSONDecoder()
+# Upper bound on '{' positions tried before giving up on a response
+_MAX_JSON_CANDIDATES = 32
+
+
+def _json_loads(text: str) -> Any:
+    """``json.loads`` via orjson when installed; raises ``ValueError`` on bad input."""
+    if _orjson is not None:
+        return _orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> str:
+    """``json.dumps`` via orjson when installed (2-space indent when ``indent``).
+
+    orjson output is compact (no space after separators) and keeps non-ASCII
+    characters as UTF-8 rather than ``\\u`` escapes; like ``json.dumps`` it
+    stringifies non-str keys and raises ``TypeError`` for unserializable values.
+    """
+    if _orjson is not None:
+        option = _orjson.OPT_NON_STR_KEYS | (_orjson.OPT_INDENT_2 if indent else 0)
+        return _orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+_CLIP_ENCODER = json.JSONEncoder(default=str)
+# Same output as json.dumps(); unserializable values raise so callers fall back to str()
+_OBS_ENCODER = json.JSONEncoder()
+# Same output as _json_dumps(indent=True) without orjson
+_PREVIEW_ENCODER = json.JSONEncoder(indent=2)
+# Cap on the serialized worker_results shown in a synthesis entry
+_WORKER_RESULTS_LIMIT = 4000
+
+
+def _clip_text(value: Any, limit: int, encoder: json.JSONEncoder = _CLIP_ENCODER) -> str:
+    """Render ``value`` as text truncated to ``limit`` characters.
+
+    Strings are sliced directly. Dicts and lists are JSON-encoded incrementally
+    and encoding stops once ``limit`` characters exist, so a large context object
+    is never fully serialized just to be cut down.
+    """
+    if isinstance(value, str):
+        return value[:limit]
+    if isinstance(value, (dict, list)):
+        parts: List[str] = []
+        size = 0
+        try:
+            for chunk in encoder.iterencode(value):
+                parts.append(chunk)
+                size += len(chunk)
+                if size >= limit:
+                    break
+        except (TypeError, ValueError):
+            return str(value)[:limit]
+        return "".join(parts)[:limit]
+    return str(value)[:limit]
+
+
+def _json_preview(value: Any, limit: int) -> str:
+    """Indented JSON of ``value`` cut to ``limit`` characters (``str()`` if unserializable).
+
+    Without orjson, dicts and lists are encoded incrementally, so a large
+    payload is not serialized in full only to be sliced.
+    """
+    if _orjson is None and isinstance(value, (dict, list)):
+        return _clip_text(value, limit, _PREVIEW_ENCODER)
+    try:
+        return _json_dumps(value, indent=True)[:limit]
+    except Exception:
+        return str(value)[:limit]
+
+
+def _plan_block(plan_limit: int) -> str:
+    """STRATEGIC PLAN / DIRECTOR CONTEXT prompt block from the request context.
+
+    The plan is shown as indented JSON cut to ``plan_limit`` characters (see
+    ``_json_preview``). Returns "" when neither value is set.
+    """
+    strategic_plan = get_from_context("strategic_plan")
+    director_context = get_from_context("context") or ""
+    plan_block = ""
+    if strategic_plan:
+        preview = _json_preview(strategic_plan, plan_limit)
+        plan_block = f"\nSTRATEGIC PLAN (from orchestrator/manager):\n{preview}\n"
+    if director_context:
+        plan_block += f"\nDIRECTOR CONTEXT: {director_context}\n"
+    return plan_block
+
+
+def _json_object_span(text: str, start: int = 0) -> Optional[Tuple[int, int]]:
+    """Return the span of the first balanced ``{...}`` at or after ``start``.
+
+    Single linear pass that only visits structural characters (braces, quotes,
+    backslashes) and tracks string and escape state, so braces inside strings
+    are ignored and unbalanced input cannot trigger regex backtracking.
+    Returns None when there is no '{' or the object never closes.
+    """
+    i = text.find("{", start)
+    if i == -1:
+        return None
+    depth = 0
+    in_string = False
+    skip_to = -1
+    for m in _JSON_STRUCTURAL_RE.finditer(text, i):
+        pos = m.start()
+        if pos < skip_to:
+            continue  # escaped character
+        c = text[pos]
+        if in_string:
+            if c == "\\":
+                skip_to = pos + 2
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return i, pos + 1
+    return None
+
+
+def _slice_json_object(text: str, start: int = 0) -> Optional[str]:
+    """First balanced JSON object in ``text``, else first '{' to last '}'.
+
+    The fallback keeps malformed objects intact so the caller's JSON error is
+    reported (ReActPlanner feeds it back to the model). Returns None when the
+    text contains no candidate object.
+    """
+    span = _json_object_span(text, start)
+    if span is not None:
+        return text[span[0]:span[1]]
+    i = text.find("{", start)
+    j = text.rfind("}")
+    if i == -1 or j < i:
+        return None
+    return text[i:j + 1]
+
+
+def _slice_json_containing(text: str, marker: str) -> Optional[str]:
+    """First '{' to last '}' of ``text``, provided ``marker`` occurs between them.
+
+    Returns the same slice as the greedy regex it replaces ('{', anything,
+    marker, anything, '}'), using three substring searches instead of a pattern
+    that backtracks quadratically when the marker is missing.
+    """
+    i = text.find("{")
+    if i == -1:
+        return None
+    k = text.rfind(marker)
+    if k < i:
+        return None
+    j = text.rfind("}")
+    if j < k + len(marker):
+        return None
+    return text[i:j + 1]
+
+
+def _json_object_containing(text: str, marker: str) -> Optional[str]:
+    """First balanced top-level JSON object in ``text`` that contains ``marker``.
+
+    Prose or a second brace block after the object no longer ends up in the
+    slice. When no balanced object qualifies (e.g. truncated output) this falls
+    back to ``_slice_json_containing`` so the parser still reports the error.
+    """
+    start = 0
+    while True:
+        span = _json_object_span(text, start)
+        if span is None:
+            break
+        if text.find(marker, span[0], span[1]) != -1:
+            return text[span[0]:span[1]]
+        start = span[1]
+    return _slice_json_containing(text, marker)
+
+
+def _extract_first_json_object(text: Any, required_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Decode the first JSON object embedded in ``text``.
+
+    Uses ``JSONDecoder.raw_decode`` from each '{' position instead of a greedy
+    first-brace-to-last-brace regex, so the text is never backtracked over and the
+    object is parsed exactly once. When ``required_key`` is given, objects
+    without that top-level key are skipped (nested objects are still tried).
+    """
+    if not isinstance(text, str):
+        return None
+    # Fast path: the whole response is a single JSON object
+    stripped = text.strip()
+    if stripped[:1] == "{" and stripped[-1:] == "}":
+        try:
+            obj = _json_loads(stripped)
+        except ValueError:
+            obj = None
+        if isinstance(obj, dict) and (required_key is None or required_key in obj):
+            return obj
+    i = text.find("{")
+    attempts = 0
+    while i != -1 and attempts < _MAX_JSON_CANDIDATES:
+        attempts += 1
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, i)
+        except ValueError:
+            obj = None
+        if isinstance(obj, dict) and (required_key is None or required_key in obj):
+            return obj
+        i = text.find("{", i + 1)
+    return None
+
+
+class _KeywordMatcher:
+    """Report which tagged keywords occur in a text using a single scan.
+
+    All keywords are compiled into one lookahead alternation (longest first), so
+    every start position is tried once; keywords that are prefixes of a longer
+    match are credited through a precomputed table. This gives the same result as
+    testing ``keyword in text`` for each keyword, without K separate scans.
+    Keywords are matched case-sensitively against the text; callers pass
+    lowercased text. When every tag is an int bit, ``mask()`` returns the hits
+    OR-ed into a single integer instead of a set.
+    """
+
+    __slots__ = ("_re", "_tags", "_always", "_bits", "_always_bits")
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]]) -> None:
+        by_keyword: Dict[str, Set[Any]] = {}
+        always: Set[Any] = set()
+        for keyword, tag in entries:
+            keyword = keyword.lower()
+            if keyword:
+                by_keyword.setdefault(keyword, set()).add(tag)
+            else:
+                always.add(tag)  # "" is contained in every string
+        self._tags: Dict[str, FrozenSet[Any]] = {
+            kw: frozenset().union(*(tags for k, tags in by_keyword.items() if kw.startswith(k)))
+            for kw in by_keyword
+        }
+        self._always: FrozenSet[Any] = frozenset(always)
+        self._bits: Optional[Dict[str, int]] = None
+        self._always_bits = 0
+        if all(type(t) is int for tags in self._tags.values() for t in tags) and all(
+            type(t) is int for t in always
+        ):
+            self._bits = {kw: functools.reduce(int.__or__, tags, 0) for kw, tags in self._tags.items()}
+            self._always_bits = functools.reduce(int.__or__, always, 0)
+        alternation = "|".join(map(re.escape, sorted(by_keyword, key=len, reverse=True)))
+        self._re = re.compile(f"(?=({alternation}))") if by_keyword else None
+
+    def hits(self, text: str) -> Set[Any]:
+        found = set(self._always)
+        if self._re is not None:
+            tags = self._tags
+            for m in self._re.finditer(text):
+                found |= tags[m.group(1)]
+        return found
+
+    def mask(self, text: str) -> int:
+        bits = self._bits
+        if bits is None:
+            raise TypeError("mask() requires int bit tags")
+        found = self._always_bits
+        if self._re is not None:
+            for m in self._re.finditer(text):
+                found |= bits[m.group(1)]
+        return found
+
+
+# Edit-intent verbs and BI artifact nouns used by StrategicPlanner's routing override
+_EDIT_VERBS = (
+    "improve", "optimiz", "fix", "update", "modify", "change", "create", "add",
+    "remove", "rename", "refactor", "rewrite", "validate", "repair", "enhance", "speed",
+)
+_BI_NOUNS = (
+    "dax", "measure", "formula", "relationship", "relationships", "table", "column",
+    "partition", "model", "semantic model", "calculated column", "calculated table",
+)
+_EDIT_TASK_TYPES = ("modification", "validate", "validation")
+_INTENT_VERB = 1
+_INTENT_NOUN = 2
+_INTENT_EDIT = _INTENT_VERB | _INTENT_NOUN
+
+_EDIT_INTENT_MATCHER = _KeywordMatcher(
+    [(v, _INTENT_VERB) for v in _EDIT_VERBS] + [(n, _INTENT_NOUN) for n in _BI_NOUNS]
+)
+
+# Keyword bits consulted by LLMRouterPlanner._heuristic_route
+_KW_UPDATE = 1
+_KW_DEACTIVATE = 2
+_KW_ACTIVATE = 4
+_KW_LIST = 8
+_KW_TABLE = 16
+_KW_UPDATE_ANY = _KW_UPDATE | _KW_DEACTIVATE | _KW_ACTIVATE
+_KW_LIST_TABLES = _KW_LIST | _KW_TABLE
+
+_ROUTE_KEYWORD_MATCHER = _KeywordMatcher([
+    ("update", _KW_UPDATE),
+    ("deactivate", _KW_DEACTIVATE),
+    ("activate", _KW_ACTIVATE),
+    ("list", _KW_LIST),
+    ("table", _KW_TABLE),
+])
 
 
 class StaticPlanner(BasePlanner):
@@ -37,14 +536,18 @@ class StaticPlanner(BasePlanner):
     - Otherwise, return a FinalResponse with a canned message.
     """
 
+    __slots__ = ("keywords", "_kw_re")
+
     def __init__(self, keywords: List[str] | None = None) -> None:
         self.keywords = ["search", "find"] if keywords is None else [k.lower() for k in keywords]
+        self._kw_re = (
+            re.compile("|".join(map(re.escape, self.keywords)), re.I) if self.keywords else None
+        )
 
     def plan(self, task_description: str, history: List[Dict[str, Any]]) -> Union[Action, List[Action], FinalResponse]:
-        task_l = task_description.lower()
-        if any(k in task_l for k in self.keywords):
+        if self._kw_re is not None and self._kw_re.search(task_description):
             return Action(tool_name="mock_search", tool_args={"query": task_description})
-        return FinalResponse(
+        return FinalResponse.trusted(
             operation="display_message",
             payload={"message": "No action needed. Task handled by planner."},
             human_readable_summary="No action needed. Task handled by planner."
@@ -58,6 +561,8 @@ class SingleActionPlanner(BasePlanner):
     Sets the configured tool as a terminal tool so the Agent stops after one execution.
     """
 
+    __slots__ = ("_tool", "_args", "terminal_tools")
+
     def __init__(self, tool_name: str, tool_args: dict, terminal: bool = True) -> None:
         self._tool = tool_name
         self._args = tool_args or {}
@@ -80,6 +585,11 @@ class LLMRouterPlanner(BasePlanner):
       {"tool": "add_relationship", "args": {"model_dir": "/...", ...}}
     """
 
+    __slots__ = (
+        "llm", "tool_specs", "default_model_dir", "system_prompt", "log_details", "logger",
+        "_response_cache", "_specs", "_args_by_tool", "_specs_str", "_prompt_prefix",
+    )
+
     def __init__(
         self,
         inference_gateway: BaseInferenceGateway,
@@ -94,25 +604,43 @@ class LLMRouterPlanner(BasePlanner):
         self.system_prompt = system_prompt or (
             "You are a router that returns a strict JSON object with fields 'tool' and 'args'."
         )
-        env_flag = os.environ.get("AGENT_LOG_ROUTER_DETAILS", "false").lower() in {"1", "true", "yes"}
+        env_flag = _env_flag("AGENT_LOG_ROUTER_DETAILS", False)
         self.log_details = log_details if log_details is not None else env_flag
-        self.logger = get_logger()
+        self.logger = _planner_logger()
+        self._response_cache = _make_response_cache()
+        # Frozen (tool, args) pairs; the spec dicts are only read here
+        self._specs: Tuple[Tuple[Any, Tuple[str, ...]], ...] = tuple(
+            (spec.get("tool"), tuple(spec.get("args", []))) for spec in self.tool_specs
+        )
+        self._args_by_tool: Dict[Any, Tuple[str, ...]] = {}
+        for tool, args in self._specs:
+            # First spec wins, matching the previous linear scan
+            self._args_by_tool.setdefault(tool, args)
+        # tool_specs and system_prompt are fixed, so the prompt prefix is built once
+        self._specs_str = "\n".join(
+            f"- {tool}: args={list(args)}" for tool, args in self._specs
+        )
+        self._prompt_prefix = (
+            f"{self.system_prompt}\n"
+            f"Allowed tools and their arguments:\n{self._specs_str}\n"
+            f"Return ONLY JSON like {{\"tool\": \"name\", \"args\": {{...}}}}.\n"
+        )
 
     def plan(self, task_description: str, history: List[Dict[str, Any]]) -> Union[Action, FinalResponse]:
         prompt = self._build_prompt(task_description)
-        raw = self.llm.invoke(prompt)
+        raw = _invoke_llm(self.llm, self._response_cache, prompt)
         if self.log_details and self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug("LLMRouterPlanner.prompt=%s", prompt)
             self.logger.debug("LLMRouterPlanner.raw_response=%s", raw)
         data = self._try_parse_json(raw)
         if not data:
             # Fallback to heuristics
-            action = self._heuristic_route(task_description)
+            action = self._heuristic_route(task_description, task_description.lower())
             if action:
                 if self.log_details and self.logger.isEnabledFor(logging.DEBUG):
                     self.logger.debug("LLMRouterPlanner.heuristic_action=%s", action)
                 return action
-            return FinalResponse(
+            return FinalResponse.trusted(
                 operation="display_message",
                 payload={"message": "Unable to route request to a known tool.", "error": True},
                 human_readable_summary="Unable to route request to a known tool."
@@ -128,59 +656,44 @@ class LLMRouterPlanner(BasePlanner):
         return Action(tool_name=tool, tool_args=args)
 
     def _build_prompt(self, task: str) -> str:
-        specs_str = "\n".join(
-            [f"- {spec.get('tool')}: args={spec.get('args', [])}" for spec in self.tool_specs]
-        )
-        return (
-            f"{self.system_prompt}\n"
-            f"Allowed tools and their arguments:\n{specs_str}\n"
-            f"Return ONLY JSON like {{\"tool\": \"name\", \"args\": {{...}}}}.\n"
-            f"User task: {task}\n"
-        )
+        return f"{self._prompt_prefix}User task: {task}\n"
 
     def _try_parse_json(self, text: str) -> Optional[Dict[str, Any]]:
         # Extract first JSON object
-        try:
-            m = re.search(r"\{[\s\S]*\}", text)
-            if not m:
-                return None
-            return json.loads(m.group(0))
-        except Exception:
-            return None
+        return _extract_first_json_object(text)
 
-    def _expected_args(self, tool: Optional[str]) -> List[str]:
-        for spec in self.tool_specs:
-            if spec.get("tool") == tool:
-                return spec.get("args", [])
-        return []
+    def _expected_args(self, tool: Optional[str]) -> Tuple[str, ...]:
+        return self._args_by_tool.get(tool, ())
 
-    def _heuristic_route(self, task: str) -> Optional[Action]:
-        t = task.lower()
+    def _heuristic_route(self, task: str, task_lower: Optional[str] = None) -> Optional[Action]:
+        t = task.lower() if task_lower is None else task_lower
+        mask = _ROUTE_KEYWORD_MATCHER.mask(t)
         # Update by id
-        m = re.search(r"(id|rel(ationship)?\s*id)\s*[:=\s]*([a-z0-9]+)", t)
-        if "update" in t or "deactivate" in t or "activate" in t or m:
+        m = _REL_ID_RE.search(t)
+        if mask & _KW_UPDATE_ANY or m:
             rel_id = m.group(3) if m else None
             args: Dict[str, Any] = {}
             if self.default_model_dir:
                 args["model_dir"] = self.default_model_dir
             if rel_id:
                 args["id"] = rel_id
-            if "deactivate" in t:
-                args["is_active"] = False
-            if "activate" in t:
-                args["is_active"] = True
+            if mask & (_KW_DEACTIVATE | _KW_ACTIVATE):
+                args["is_active"] = not mask & _KW_DEACTIVATE
             if args:
                 return Action(tool_name="update_relationship", tool_args=args)
         # List tables
-        if "list" in t and "table" in t:
+        if mask & _KW_LIST_TABLES == _KW_LIST_TABLES:
             args: Dict[str, Any] = {}
             if self.default_model_dir:
                 args["model_dir"] = self.default_model_dir
             return Action(tool_name="list_tables", tool_args=args)
         # Add relationship: parse 'Table'[Column] patterns
-        pairs = re.findall(r"'([^']+)'\s*\[([^\]]+)\]", task)
-        if len(pairs) >= 2:
-            (ft, fc), (tt, tc) = pairs[0], pairs[1]
+        # Only the first two matches are used; stop scanning after them
+        matches = _TABLE_COL_RE.finditer(task)
+        first = next(matches, None)
+        second = next(matches, None) if first is not None else None
+        if second is not None:
+            (ft, fc), (tt, tc) = first.groups(), second.groups()
             args = {"from_table": ft, "from_column": fc, "to_table": tt, "to_column": tc}
             if self.default_model_dir:
                 args["model_dir"] = self.default_model_dir
@@ -188,6 +701,30 @@ class LLMRouterPlanner(BasePlanner):
         return None
 
 
+# Canonical StrategicPlanner system prompt. Kept byte-identical across calls
+# (no interpolation) so providers can serve it from their prompt cache; the
+# per-call worker list and task go in the final user message.
+_STRATEGIC_PLANNING_PROMPT = """You are a strategic planner creating execution plans for complex tasks.
+
+Your role:
+1. Analyze the user's request deeply
+2. Break it into concrete, sequential steps
+3. Identify which workers/specialists are needed
+4. Provide rich context for each step
+
+Return JSON:
+{
+  "plan": {
+    "steps": [
+      {"action": "...", "worker": "...", "context": "..."},
+      ...
+    ],
+    "rationale": "Why this plan will succeed",
+    "primary_worker": "worker_key"
+  }
+}"""
+
+
 class StrategicPlanner(BasePlanner):
     """Strategic planning layer that creates execution plans and delegates with context.
     
@@ -203,6 +740,13 @@ class StrategicPlanner(BasePlanner):
     - Worker: Operational execution
     """
     
+    __slots__ = (
+        "worker_keys", "_worker_key_set", "llm", "planning_prompt", "history_filter", "logger",
+        "_response_cache",
+    )
+    
+    _FILTER_CONTEXT: Dict[str, Any] = {"role": "orchestrator", "max_conversation_turns": 8}
+    
     def __init__(
         self,
         worker_keys: List[str],
@@ -212,102 +756,83 @@ class StrategicPlanner(BasePlanner):
         **kwargs
     ) -> None:
         self.worker_keys = worker_keys or []
+        self._worker_key_set = frozenset(self.worker_keys)
         self.llm = inference_gateway
         self.planning_prompt = planning_prompt or self._default_planning_prompt()
         self.history_filter = history_filter or OrchestratorHistoryFilter()
-        self.logger = get_logger()
+        self.logger = _planner_logger()
+        self._response_cache = _make_response_cache()
+    
+    def _filter_history(self, history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filter history for the orchestrator prompt."""
+        return self.history_filter.filter_for_prompt(history, dict(self._FILTER_CONTEXT))
     
     def _parse_script_response(self, response: Union[str, Dict[str, Any], ScriptPlan]) -> Optional[ScriptPlan]:
         if isinstance(response, ScriptPlan):
             return response
         if isinstance(response, dict):
             try:
-                return ScriptPlan.model_validate(response)
+                return _SCRIPT_PLAN_ADAPTER.validate_python(response)
             except ValidationError:
                 try:
-                    return ScriptPlan.model_validate_json(json.dumps(response))
+                    return _SCRIPT_PLAN_ADAPTER.validate_json(_json_dumps(response))
                 except ValidationError:
                     return None
         text = response if isinstance(response, str) else str(response)
-        match = re.search(r"\{[\s\S]*\"script\"[\s\S]*\}", text)
-        if not match:
+        obj = _extract_first_json_object(text, "script")
+        if obj is None:
             return None
-        json_text = match.group(0)
         try:
-            return ScriptPlan.model_validate_json(json_text)
+            return _SCRIPT_PLAN_ADAPTER.validate_python(obj)
         except ValidationError as ve:
             self.logger.debug("ManagerScriptPlanner: script validation error %s", ve)
             return None
 
     def _default_planning_prompt(self) -> str:
-        return """You are a strategic planner creating execution plans for complex tasks.
-
-Your role:
-1. Analyze the user's request deeply
-2. Break it into concrete, sequential steps
-3. Identify which workers/specialists are needed
-4. Provide rich context for each step
-
-Return JSON:
-{
-  "plan": {
-    "steps": [
-      {"action": "...", "worker": "...", "context": "..."},
-      ...
-    ],
-    "rationale": "Why this plan will succeed",
-    "primary_worker": "worker_key"
-  }
-}"""
+        return _STRATEGIC_PLANNING_PROMPT
     
     def plan(self, task_description: str, history: List[Dict[str, Any]]) -> Union[Action, FinalResponse]:
         """Create strategic plan and delegate to primary worker with full context."""
         # Build planning prompt with conversation history and optional director/data model context
         workers_list = ", ".join(self.worker_keys)
+        task_lower = (task_description or "").lower()
 
         messages = [{"role": "system", "content": self.planning_prompt}]
 
         # Inject contextual blocks if present (director_context and/or data_model_context)
         try:
-            from ..services.request_context import get_from_context as _ctx
-            director_context = _ctx("director_context") or _ctx("context")
+            director_context = get_from_context("director_context") or get_from_context("context")
         except Exception:
             director_context = None
         try:
-            from ..services.request_context import get_from_context as _ctx2
-            data_model_context = _ctx2("data_model_context")
+            data_model_context = get_from_context("data_model_context")
         except Exception:
             data_model_context = None
 
         context_parts = []
         if director_context:
-            context_parts.append(f"DIRECTOR CONTEXT:\n{str(director_context)[:4000]}")
+            context_parts.append(f"DIRECTOR CONTEXT:\n{_clip_text(director_context, 4000)}")
         if data_model_context:
-            context_parts.append(f"DATA MODEL CONTEXT:\n{str(data_model_context)[:4000]}")
+            context_parts.append(f"DATA MODEL CONTEXT:\n{_clip_text(data_model_context, 4000)}")
         if context_parts:
             messages.append({"role": "system", "content": "\n\n".join(context_parts)})
         
         # Filter history using hierarchical filter (orchestrator gets conversation summary only)
-        import os as _os
         include_conv = True
         if director_context:
-            try:
-                include_conv = str(_os.getenv("STRATEGIC_INCLUDE_HISTORY_WITH_DIRECTOR", "false")).lower() in {"1", "true", "yes"}
-            except Exception:
-                include_conv = False
+            include_conv = _env_flag("STRATEGIC_INCLUDE_HISTORY_WITH_DIRECTOR", False)
         
         if include_conv:
             # Use history filter to get appropriate history for orchestrator role
-            filter_context = {"role": "orchestrator", "max_conversation_turns": 8}
-            filtered_history = self.history_filter.filter_for_prompt(history, filter_context)
+            filtered_history = self._filter_history(history)
             
             # Build messages from filtered conversation history only
+            role_for_type = _CONVERSATION_ROLE_FOR_TYPE
+            messages_append = messages.append
             for entry in filtered_history:
-                entry_type = entry.get("type")
-                if entry_type == USER_MESSAGE:
-                    messages.append({"role": "user", "content": entry.get("content", "")})
-                elif entry_type == ASSISTANT_MESSAGE:
-                    messages.append({"role": "assistant", "content": entry.get("content", "")})
+                role = role_for_type.get(entry.get("type"))
+                if role is not None:
+                    messages_append({"role": role, "content": entry.get("content", "")})
         
         # Add current task
         messages.append({"role": "user", "content": f"""
@@ -319,15 +844,12 @@ Identify the primary worker and provide context for execution.
 """})
         
         # Get strategic plan from LLM
-        response = self.llm.invoke(messages)
+        response = _invoke_llm(self.llm, self._response_cache, messages)
         
         # Parse plan
-        import json
-        import re
         try:
-            match = re.search(r'\{[\s\S]*"plan"[\s\S]*\}', response)
-            if match:
-                parsed = json.loads(match.group(0))
+            parsed = _extract_first_json_object(response, "plan")
+            if parsed is not None:
                 plan_data = parsed.get("plan", {})
                 
                 # Extract parallel workers (optional) or fall back to primary worker
@@ -339,32 +861,27 @@ Identify the primary worker and provide context for execution.
                         parallel_workers = top_level_parallel
                 if isinstance(parallel_workers, list):
                     # Filter to known workers and ensure uniqueness
-                    valid = [w for w in parallel_workers if isinstance(w, str) and w in self.worker_keys]
-                    valid = list(dict.fromkeys(valid))  # de-dupe, preserve order
+                    seen: Set[str] = set()
+                    seen_add = seen.add
+                    worker_key_set = self._worker_key_set
+                    # Known workers only, de-duped in order (seen_add returns None)
+                    valid = [
+                        w for w in parallel_workers
+                        if isinstance(w, str) and w in worker_key_set and not (w in seen or seen_add(w))
+                    ]
                 else:
                     valid = []
                 # Primary worker fallback
                 primary_worker = plan_data.get("primary_worker", (valid[0] if valid else self.worker_keys[0]))
 
                 # Heuristic override: route modification/validation of Power BI artifacts to powerbi-designer
-                try:
+                if "powerbi-designer" in self._worker_key_set:
                     task_type = str(plan_data.get("task_type", "")).lower()
-                    td = (task_description or "").lower()
-                    wants_edit = any(k in task_type for k in ("modification", "validate", "validation"))
-                    # Edit-intent verbs and BI artifact nouns
-                    edit_verbs = [
-                        "improve", "optimiz", "fix", "update", "modify", "change", "create", "add",
-                        "remove", "rename", "refactor", "rewrite", "validate", "repair", "enhance", "speed"
-                    ]
-                    bi_nouns = [
-                        "dax", "measure", "formula", "relationship", "relationships", "table", "column",
-                        "partition", "model", "semantic model", "calculated column", "calculated table"
-                    ]
-                    inferred_edit = any(v in td for v in edit_verbs) and any(n in td for n in bi_nouns)
-                    if (wants_edit or inferred_edit) and ("powerbi-designer" in self.worker_keys):
+                    wants_edit = any(k in task_type for k in _EDIT_TASK_TYPES)
+                    # Edit-intent verbs and BI artifact nouns, matched in one pass
+                    inferred_edit = _EDIT_INTENT_MATCHER.mask(task_lower) == _INTENT_EDIT
+                    if wants_edit or inferred_edit:
                         primary_worker = "powerbi-designer"
-                except Exception:
-                    pass
                 
                 # Log the strategic plan for visibility
                 # Check both "steps" (legacy/default format) and "phases" (orchestrator format)
@@ -399,7 +916,7 @@ Identify the primary worker and provide context for execution.
                         }
                     )
         except Exception as e:
-            self.logger.warning(f"Failed to parse strategic plan: {e}, falling back to simple routing")
+            self.logger.warning("Failed to parse strategic plan: %s, falling back to simple routing", e)
         
         # Fallback: simple routing
         return Action(tool_name=self.worker_keys[0], tool_args={})
@@ -423,6 +940,12 @@ class WorkerRouterPlanner(BasePlanner):
       - log_details: optional bool to emit DEBUG logs
     """
 
+    __slots__ = (
+        "worker_keys", "_worker_key_set", "rules", "llm", "default_worker", "system_prompt",
+        "log_details", "logger", "_response_cache", "_rule_matcher", "_include_history",
+        "_max_history",
+    )
+
     def __init__(
         self,
         worker_keys: List[str],
@@ -433,26 +956,31 @@ class WorkerRouterPlanner(BasePlanner):
         log_details: Optional[bool] = None,
     ) -> None:
         self.worker_keys = worker_keys or []
+        self._worker_key_set = frozenset(self.worker_keys)
         self.rules = rules or []
         self.llm = inference_gateway
         self.default_worker = default_worker
         self.system_prompt = system_prompt or (
             "You are a strict classifier. Choose the best worker key for the task from the provided options and return only JSON {\"worker\": \"<key>\", \"reason\": \"...\"}."
         )
-        env_flag = os.environ.get("AGENT_LOG_ROUTER_DETAILS", "false").lower() in {"1", "true", "yes"}
+        env_flag = _env_flag("AGENT_LOG_ROUTER_DETAILS", False)
         self.log_details = log_details if log_details is not None else env_flag
-        self.logger = get_logger()
+        self.logger = _planner_logger()
+        self._response_cache = _make_response_cache()
+        self._rule_matcher = _KeywordMatcher(
+            (keyword, (idx, kind))
+            for idx, rule in enumerate(self.rules)
+            for kind in ("include", "exclude")
+            for keyword in rule.get(kind, [])
+        )
 
         # Optional env-based history controls for router prompts
-        self._include_history: bool = os.getenv("AGENT_ROUTER_INCLUDE_HISTORY", "true").lower() in {"1", "true", "yes"}
-        try:
-            self._max_history: int = int(os.getenv("AGENT_ROUTER_MAX_HISTORY_MESSAGES", "20"))
-        except Exception:
-            self._max_history = 20
+        self._include_history: bool = _env_flag("AGENT_ROUTER_INCLUDE_HISTORY", True)
+        self._max_history: int = _env_int("AGENT_ROUTER_MAX_HISTORY_MESSAGES", 20)
 
     def plan(self, task_description: str, history: List[Dict[str, Any]]) -> Union[Action, FinalResponse]:
         # 1) Apply heuristic rules first
-        worker = self._apply_rules(task_description)
+        worker = self._apply_rules(task_description.lower()) if self.rules else None
         if worker:
             if self.log_details and self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug("WorkerRouterPlanner.rules_selected worker=%s", worker)
@@ -461,36 +989,34 @@ class WorkerRouterPlanner(BasePlanner):
         # 2) Ask LLM to pick a worker
         if self.llm and self.worker_keys:
             prompt = self._build_prompt(task_description, history)
-            raw = self.llm.invoke(prompt)
+            raw = _invoke_llm(self.llm, self._response_cache, prompt)
             if self.log_details and self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug("WorkerRouterPlanner.prompt=%s", prompt)
                 self.logger.debug("WorkerRouterPlanner.raw_response=%s", raw)
             worker = self._parse_worker(raw)
-            if worker and worker in self.worker_keys:
+            if worker and worker in self._worker_key_set:
                 return Action(tool_name=worker, tool_args={})
-            if self.default_worker and self.default_worker in self.worker_keys:
+            if self.default_worker and self.default_worker in self._worker_key_set:
                 return Action(tool_name=self.default_worker, tool_args={})
 
         # 3) Fallback: graceful final response from orchestrator
-        return FinalResponse(
+        return FinalResponse.trusted(
             operation="display_message",
             payload={"message": "I'm not sure which capability should handle this. Could you clarify what you want to do?"},
             human_readable_summary="I'm not sure which capability should handle this. Could you clarify what you want to do?"
         )
 
-    def _apply_rules(self, task: str) -> Optional[str]:
-        t = task.lower()
-        for rule in self.rules:
+    def _apply_rules(self, task_lower: str) -> Optional[str]:
+        hits = self._rule_matcher.hits(task_lower)
+        for idx, rule in enumerate(self.rules):
             worker = rule.get("worker")
             if not worker:
                 continue
-            include: List[str] = [s.lower() for s in rule.get("include", [])]
-            exclude: List[str] = [s.lower() for s in rule.get("exclude", [])]
-            if include and not any(k in t for k in include):
+            if rule.get("include") and (idx, "include") not in hits:
                 continue
-            if exclude and any(k in t for k in exclude):
+            if rule.get("exclude") and (idx, "exclude") in hits:
                 continue
-            if self.worker_keys and worker not in self.worker_keys:
+            if self.worker_keys and worker not in self._worker_key_set:
                 continue
             return worker
         return None
@@ -499,31 +1025,17 @@ class WorkerRouterPlanner(BasePlanner):
         options = ", ".join(self.worker_keys)
         
         # Include strategic plan/context if available to improve routing
-        strategic_plan = get_from_context("strategic_plan")
-        director_context = get_from_context("context") or ""
-        plan_block = ""
-        if strategic_plan:
-            try:
-                import json as _json
-                plan_block = f"\nSTRATEGIC PLAN (from orchestrator/manager):\n{_json.dumps(strategic_plan, indent=2)[:800]}\n"
-            except Exception:
-                plan_block = f"\nSTRATEGIC PLAN (from orchestrator/manager):\n{str(strategic_plan)[:800]}\n"
-        if director_context:
-            plan_block += f"\nDIRECTOR CONTEXT: {director_context}\n"
+        plan_block = _plan_block(800)
 
-        messages = [
-            {"role": "system", "content": f"{self.system_prompt}\n{plan_block}"}
-        ]
+        # Keep the system prompt as its own byte-stable message (cacheable prefix);
+        # per-call plan/director context follows in a separate system message.
+        messages = [{"role": "system", "content": self.system_prompt}]
+        if plan_block:
+            messages.append({"role": "system", "content": plan_block.strip()})
         
         # Add conversation history for context (optional, capped)
         if self._include_history:
-            convo_msgs: List[Dict[str, str]] = []
-            for entry in history:
-                t = entry.get("type")
-                if t == USER_MESSAGE:
-                    convo_msgs.append({"role": "user", "content": entry.get("content", "")})
-                elif t == ASSISTANT_MESSAGE:
-                    convo_msgs.append({"role": "assistant", "content": entry.get("content", "")})
+            convo_msgs = self._conversation_messages(history)
             if self._max_history and self._max_history > 0:
                 convo_msgs = convo_msgs[-self._max_history:]
             messages.extend(convo_msgs)
@@ -538,18 +1050,25 @@ class WorkerRouterPlanner(BasePlanner):
         
         return messages
 
+    def _conversation_messages(self, history: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Chat messages for the conversation entries in ``history``."""
+        role_for_type = _CONVERSATION_ROLE_FOR_TYPE
+        convo_msgs: List[Dict[str, str]] = []
+        convo_append = convo_msgs.append
+        for entry in history:
+            role = role_for_type.get(entry.get("type"))
+            if role is not None:
+                convo_append({"role": role, "content": entry.get("content", "")})
+        return convo_msgs
+
     def _parse_worker(self, text: str) -> Optional[str]:
-        try:
-            m = re.search(r"\{[\s\S]*\}", text)
-            if not m:
-                return None
-            obj = json.loads(m.group(0))
-            val = obj.get("worker")
-            if isinstance(val, str):
-                return val
-            return None
-        except Exception:
+        obj = _extract_first_json_object(text)
+        if obj is None:
             return None
+        val = obj.get("worker")
+        if isinstance(val, str):
+            return val
+        return None
 
 
 class ChatPlanner(BasePlanner):
@@ -563,48 +1082,101 @@ class ChatPlanner(BasePlanner):
       - inference_gateway: BaseInferenceGateway (required)
       - system_prompt: optional str defining the assistant's persona
       - max_history_messages: optional int limiting context window (default: 20)
+      - replay_cache: optional bool; when the latest assistant reply answered the same
+        user text, return it without calling the LLM (env AGENT_CHATPLANNER_REPLAY_CACHE)
     """
 
+    __slots__ = ("llm", "system_prompt", "max_history", "replay_cache", "_response_cache")
+
     def __init__(
         self,
         inference_gateway: BaseInferenceGateway,
         system_prompt: Optional[str] = None,
         max_history_messages: Optional[int] = None,
+        replay_cache: Optional[bool] = None,
     ) -> None:
         self.llm = inference_gateway
         self.system_prompt = system_prompt or "You are a helpful AI assistant."
         self.max_history = max_history_messages or 20
+        env_flag = _env_flag("AGENT_CHATPLANNER_REPLAY_CACHE", False)
+        self.replay_cache = replay_cache if replay_cache is not None else env_flag
+        self._response_cache = _make_response_cache()
 
     def plan(self, task_description: str, history: List[Dict[str, Any]]) -> Union[Action, FinalResponse]:
+        if self.replay_cache:
+            cached = self._replayed_reply(task_description, history)
+            if cached is not None:
+                return FinalResponse(
+                    operation="display_message",
+                    payload={"message": cached},
+                    human_readable_summary=cached
+                )
+
         # Build message list from history
         messages: List[Dict[str, str]] = [{"role": "system", "content": self.system_prompt}]
         
-        # Extract recent conversation turns from memory
+        # Extract recent conversation turns from memory (user/assistant messages,
+        # plus legacy task/final entries for backward compatibility)
+        role_for_type = _CHAT_ROLE_FOR_TYPE
+        messages_append = messages.append
         for entry in history[-self.max_history:]:
-            entry_type = entry.get("type")
-            content = entry.get("content", "")
-            # Handle new conversation message types
-            if entry_type == USER_MESSAGE:
-                messages.append({"role": "user", "content": content})
-            elif entry_type == ASSISTANT_MESSAGE:
-                messages.append({"role": "assistant", "content": content})
-            # Handle legacy message types for backward compatibility
-            elif entry_type == TASK:
-                messages.append({"role": "user", "content": content})
-            elif entry_type == FINAL:
-                messages.append({"role": "assistant", "content": content})
+            role = role_for_type.get(entry.get("type"))
+            if role is not None:
+                messages_append({"role": role, "content": entry.get("content", "")})
         
         # Add current user message
         messages.append({"role": "user", "content": task_description})
         
         # Get LLM response
-        response = self.llm.invoke(messages)
+        response = _invoke_llm(self.llm, self._response_cache, messages)
         return FinalResponse(
             operation="display_message",
             payload={"message": response},
             human_readable_summary=response
         )
 
+    @staticmethod
+    def _replayed_reply(task_description: str, history: List[Dict[str, Any]]) -> Optional[str]:
+        """Return the latest assistant reply if it directly answered ``task_description``."""
+        for i in range(len(history) - 1, 0, -1):
+            if history[i].get("type") != ASSISTANT_MESSAGE:
+                continue
+            prev = history[i - 1]
+            if prev.get("type") == USER_MESSAGE and prev.get("content") == task_description:
+                reply = history[i].get("content")
+                return reply if isinstance(reply, str) else None
+            return None
+        return None
+
+
+def _prune_schema_properties(props: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce JSON-schema properties to the subset used in OpenAI tool schemas."""
+    pruned: Dict[str, Any] = {}
+    for key, spec in (props or {}).items():
+        if not isinstance(spec, dict):
+            pruned[key] = {"type": "string"}
+            continue
+        entry: Dict[str, Any] = {}
+        t = spec.get("type")
+        if isinstance(t, str):
+            entry["type"] = t
+        elif isinstance(t, list):
+            # pick a reasonable type if union
+            entry["type"] = next((x for x in t if isinstance(x, str)), "string")
+        else:
+            entry["type"] = "string"
+
+        # For array types, preserve the items field (required for OpenAI function calling)
+        if entry.get("type") == "array" and "items" in spec:
+            entry["items"] = spec["items"]
+
+        if spec.get("description"):
+            entry["description"] = spec.get("description")
+        if isinstance(spec.get("enum"), list):
+            entry["enum"] = spec["enum"]
+        pruned[key] = entry
+    return pruned
+
 
 class ReActPlanner(BasePlanner):
     """ReAct (Reasoning + Acting) planner for iterative tool use.
@@ -620,6 +1192,16 @@ class ReActPlanner(BasePlanner):
       - system_prompt: optional str defining reasoning style
     """
 
+    __slots__ = (
+        "llm", "tool_descriptions", "_tool_objects", "max_iterations", "system_prompt",
+        "logger", "terminal_tools", "use_llm_termination", "use_function_calling",
+        "max_parallel_tool_calls", "_last_is_final_step", "_include_history", "_include_traces",
+        "_include_global_updates", "_max_history", "_obs_truncate_len", "history_filter",
+        "_termination_guidance", "_tools_str_cache", "_tools_schema_cache",
+        "_rendered_text", "_rendered_chat", "_env_model_dir", "_text_renderers",
+        "_chat_renderers", "_normalizers", "_expected_args_cache",
+    )
+
     def __init__(
         self,
         inference_gateway: BaseInferenceGateway,
@@ -643,7 +1225,7 @@ class ReActPlanner(BasePlanner):
             "Return JSON: {\"thought\": \"...\", \"action\": \"tool_name\", \"args\": {...}} or "
             "{\"thought\": \"...\", \"final_answer\": \"...\"}."
         )
-        self.logger = get_logger()
+        self.logger = _planner_logger()
         self.terminal_tools = list(terminal_tools or [])
         self.use_llm_termination = use_llm_termination if use_llm_termination is not None else True
         self.use_function_calling = use_function_calling if use_function_calling is not None else False
@@ -651,36 +1233,55 @@ class ReActPlanner(BasePlanner):
         self.max_parallel_tool_calls: Optional[int] = max_parallel_tool_calls
         # Store LLM's termination signal from most recent plan() call
         self._last_is_final_step: Optional[bool] = None
+        # MODEL_DIR fallback for tools taking model_dir; see refresh_env()
+        self._env_model_dir: Optional[str] = os.environ.get("MODEL_DIR")
+        # Per-tool argument normalizers, built on first use; cleared by configure_tools
+        self._normalizers: Dict[str, Callable[[Any], Dict[str, Any]]] = {}
+        # Static part of the text-mode prompt, kept byte-identical across iterations
+        self._termination_guidance = (
+            "\nIMPORTANT: Include 'is_final_step' in your JSON response:\n"
+            "- Set 'is_final_step': true if this action will COMPLETE the user's request (e.g., pure informational queries like 'list tables')\n"
+            "- Set 'is_final_step': false if more steps are needed AFTER this action (e.g., verification before modification)\n"
+            "- Omit 'is_final_step' only if uncertain (defaults to legacy terminal_tools behavior)\n"
+        ) if self.use_llm_termination else ""
+        # (tool_descriptions list, rendered tools block); rebuilt if the list is replaced
+        self._tools_str_cache: Optional[Tuple[List[Dict[str, Any]], str]] = None
+        # (tool_descriptions list, tools schema); cleared by configure_tools
+        self._tools_schema_cache: Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = None
+        # (tool_descriptions list, {tool name: expected arg names}); cleared by configure_tools
+        self._expected_args_cache: Optional[Tuple[List[Dict[str, Any]], Dict[str, Tuple[str, ...]]]] = None
 
         # Env-driven prompt controls (defaults preserve existing behavior)
-        def _flag(name: str, default: bool) -> bool:
-            val = os.getenv(name)
-            if val is None:
-                return default
-            return str(val).lower() in {"1", "true", "yes"}
-
-        def _int(name: str, default: Optional[int]) -> Optional[int]:
-            try:
-                val = os.getenv(name)
-                if val is None or str(val).strip() == "":
-                    return default
-                return int(str(val).strip())
-            except Exception:
-                return default
 
         # Whether to include any prior history items (conversation turns)
-        self._include_history: bool = _flag("AGENT_REACT_INCLUDE_HISTORY", True)
+        self._include_history: bool = _env_flag("AGENT_REACT_INCLUDE_HISTORY", True)
         # Whether to include execution traces (action/observation, global_observation)
-        self._include_traces: bool = _flag("AGENT_REACT_INCLUDE_TRACES", True)
+        self._include_traces: bool = _env_flag("AGENT_REACT_INCLUDE_TRACES", True)
         # Whether to include global updates in prompts
-        self._include_global_updates: bool = _flag("AGENT_REACT_INCLUDE_GLOBAL_UPDATES", True)
+        self._include_global_updates: bool = _env_flag("AGENT_REACT_INCLUDE_GLOBAL_UPDATES", True)
         # Cap the number of history entries appended (None = unlimited)
-        self._max_history: Optional[int] = _int("AGENT_REACT_MAX_HISTORY_MESSAGES", None)
+        self._max_history: Optional[int] = _env_int("AGENT_REACT_MAX_HISTORY_MESSAGES", None)
         # Truncate observation/global_observation payloads when rendering (applies to text + function-calling)
-        self._obs_truncate_len: int = _int("AGENT_REACT_OBS_TRUNCATE_LEN", 1000) or 1000
+        self._obs_truncate_len: int = _env_int("AGENT_REACT_OBS_TRUNCATE_LEN", 1000) or 1000
         # History filter for hierarchical filtering (worker gets current turn only)
-        from ..policies.history_filters import WorkerHistoryFilter
         self.history_filter = history_filter or WorkerHistoryFilter()
+        # Rendered history window (text lines / chat messages), reused across iterations
+        self._rendered_text = _EntryRenderCache()
+        self._rendered_chat = _EntryRenderCache()
+        # Entry type -> renderer, holding only the types the include flags allow
+        self._text_renderers: Dict[str, Callable[[Dict[str, Any]], str]] = {}
+        self._chat_renderers: Dict[str, Callable[[Dict[str, Any]], Dict[str, str]]] = {}
+        if self._include_history:
+            for t in (USER_MESSAGE, ASSISTANT_MESSAGE):
+                self._text_renderers[t] = self._text_conversation
+                self._chat_renderers[t] = self._chat_conversation
+        if self._include_traces:
+            self._text_renderers[ACTION] = self._text_action
+            self._chat_renderers[ACTION] = self._chat_action
+            obs_types = (OBSERVATION, GLOBAL_OBSERVATION) if self._include_global_updates else (OBSERVATION,)
+            for t in obs_types:
+                self._text_renderers[t] = self._text_observation
+                self._chat_renderers[t] = self._chat_observation
 
     def plan(self, task_description: str, history: List[Dict[str, Any]]) -> Union[Action, List[Action], FinalResponse]:
         # Note: max_iterations check moved to Agent.run() for accurate parallel action counting
@@ -709,32 +1310,13 @@ class ReActPlanner(BasePlanner):
         # Handle JSON parsing errors with feedback to memory for next iteration
         if "_parse_error" in decision:
             error_msg = decision["_parse_error"]
-            self.logger.warning(f"JSON parse error detected: {error_msg}")
+            self.logger.warning("JSON parse error detected: %s", error_msg)
             
             # Add parse error hint to memory for next iteration
             # This creates a feedback loop: Agent → Error → Hint → Agent tries again
-            parse_error_hint = (
-                f"⚠️ JSON PARSE ERROR: Your previous response had malformed JSON: {error_msg}\n"
-                f"IMPORTANT: When using python_interpreter with complex code:\n"
-                f"1. Keep code simple and on fewer lines\n"
-                f"2. Avoid nested quotes in JSON\n"
-                f"3. Use simpler variable names\n"
-                f"4. Or use final_answer to return results directly\n"
-                f"Please try again with simpler formatting."
-            )
-            
             # This will be picked up in the next iteration via memory/history
             # The agent loop will call plan() again with this hint in history
-            return FinalResponse(
-                operation="display_message",
-                payload={
-                    "message": parse_error_hint,
-                    "error": True,
-                    "parse_error": True,
-                    "hint": "Retry with simpler code formatting"
-                },
-                human_readable_summary=f"JSON parse error - need to retry with simpler formatting"
-            )
+            return _parse_error_response(error_msg)
         
         # Check for new structured final_response format
         if "final_response" in decision:
@@ -746,7 +1328,7 @@ class ReActPlanner(BasePlanner):
                     human_readable_summary=final_resp_data.get("human_readable_summary", "Task completed.")
                 )
             except Exception as e:
-                self.logger.warning(f"Failed to parse final_response: {e}, falling back to legacy format")
+                self.logger.warning("Failed to parse final_response: %s, falling back to legacy format", e)
         
         # Legacy support: simple final_answer string (or dict, convert if needed)
         if decision.get("final_answer"):
@@ -754,12 +1336,11 @@ class ReActPlanner(BasePlanner):
             
             # If final_answer is a dict/list, convert to readable string
             if isinstance(final_answer, (dict, list)):
-                import json
                 final_answer = json.dumps(final_answer, indent=2)
             elif not isinstance(final_answer, str):
                 final_answer = str(final_answer)
             
-            return FinalResponse(
+            return FinalResponse.trusted(
                 operation="display_message",
                 payload={"message": final_answer},
                 human_readable_summary=final_answer
@@ -769,162 +1350,251 @@ class ReActPlanner(BasePlanner):
         self._last_is_final_step = decision.get("is_final_step")
         
         tool_name = decision.get("action")
-        tool_args = decision.get("args", {})
-        # Normalize args: support dicts and positional lists by mapping to expected arg names
-        expected = self._expected_args_for_tool(tool_name)
-        if tool_args is None:
-            tool_args = {}
-        if isinstance(tool_args, list):
-            mapped: Dict[str, Any] = {}
-            for i, val in enumerate(tool_args):
-                if i < len(expected):
-                    mapped[expected[i]] = val
-            tool_args = mapped
-        if not isinstance(tool_args, dict):
-            tool_args = {}
-        # Provide/override MODEL_DIR when expected and value is missing, placeholder, or invalid
-        if "model_dir" in expected:
-            env_model_dir = os.environ.get("MODEL_DIR")
-            md = tool_args.get("model_dir")
-            placeholder_vals = {"model_dir", "<model_dir>", "${model_dir}", "${MODEL_DIR}"}
-            needs_inject = (
-                md is None
-                or (isinstance(md, str) and md.strip() in placeholder_vals)
-            )
-            # If provided but not a directory, prefer env
-            if not needs_inject and isinstance(md, str):
-                try:
-                    import os as _os
-                    if not _os.path.isdir(md):
-                        needs_inject = True
-                except Exception:
-                    needs_inject = True
-            if needs_inject and env_model_dir:
-                tool_args["model_dir"] = env_model_dir
-        # Coerce precision to int when provided as string
-        if "precision" in expected and isinstance(tool_args.get("precision"), str):
-            try:
-                tool_args["precision"] = int(tool_args["precision"]) 
-            except Exception:
-                tool_args.pop("precision", None)
+        tool_args = self._args_normalizer(tool_name)(decision.get("args", {}))
         if tool_name:
             return Action(tool_name=tool_name, tool_args=tool_args)
         
         # Fallback if parsing fails
-        return FinalResponse(
-            operation="display_message",
-            payload={"message": "Unable to determine next action.", "error": True},
-            human_readable_summary="Unable to determine next action."
-        )
+        return _unable_to_plan_response()
 
-    def _build_react_prompt(self, task: str, history: List[Dict[str, Any]]) -> str:
-        # Filter history using hierarchical filter (worker gets current turn only)
-        filter_context = {"role": "worker"}
-        filtered_history = self.history_filter.filter_for_prompt(history, filter_context)
-        
+    def _tools_str(self) -> str:
+        cached = self._tools_str_cache
+        if cached is not None and cached[0] is self.tool_descriptions:
+            return cached[1]
         tools_str = "\n".join([
             f"- {t['name']}: {t.get('description', '')} (args: {t.get('args', [])})"
             for t in self.tool_descriptions
         ])
+        self._tools_str_cache = (self.tool_descriptions, tools_str)
+        return tools_str
+
+    def _filter_history(self, history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filter history for the worker prompt (worker gets current turn only)."""
+        return self.history_filter.filter_for_prompt(history, {"role": "worker"})
+
+    def _build_react_prompt(self, task: str, history: List[Dict[str, Any]]) -> str:
+        # Filter history using hierarchical filter (worker gets current turn only)
+        filtered_history = self._filter_history(history)
+        
+        tools_str = self._tools_str()
         
         # Inject strategic plan/context if available
-        strategic_plan = get_from_context("strategic_plan")
-        director_context = get_from_context("context") or ""
-        plan_block = ""
-        if strategic_plan:
-            try:
-                import json as _json
-                plan_block = f"\nSTRATEGIC PLAN (from orchestrator/manager):\n{_json.dumps(strategic_plan, indent=2)[:1500]}\n"
-            except Exception:
-                plan_block = f"\nSTRATEGIC PLAN (from orchestrator/manager):\n{str(strategic_plan)[:1500]}\n"
-        if director_context:
-            plan_block += f"\nDIRECTOR CONTEXT: {director_context}\n"
+        plan_block = _plan_block(1500)
 
-        # Build gated history string from filtered history
+        # Build gated history lines from filtered history, capped to max history (keep tail)
         history_lines: List[str] = []
-        if self._include_history or self._include_traces:
+        if self._text_renderers:
+            history_lines = self._render_history(filtered_history, self._rendered_text, self._render_text_entry)
+
+        # Order from most to least stable so providers can reuse the cached prefix:
+        # system prompt, tools and termination guidance are identical across
+        # iterations, history only grows, and plan/context/task change per call.
+        # Everything is written into one buffer so the (up to obs_truncate_len
+        # sized) history lines are copied once, not into a history string first.
+        buf = StringIO()
+        buf_write = buf.write
+        buf_write(self.system_prompt)
+        buf_write(_REACT_TOOLS_HEADER)
+        buf_write(tools_str)
+        buf_write("\n")
+        buf_write(self._termination_guidance)
+        for line in history_lines:
+            buf_write("\n")
+            buf_write(line)
+        buf_write("\n\n")
+        buf_write(plan_block)
+        buf_write(f"Task: {task}")
+        buf_write(_REACT_QUESTION)
+        return buf.getvalue()
+
+    def _render_history(
+        self,
+        filtered_history: List[Dict[str, Any]],
+        cache: _EntryRenderCache,
+        render: Callable[[Dict[str, Any]], Any],
+    ) -> List[Any]:
+        """Render history entries in order, keeping only the newest ``max_history``.
+
+        Renderings from the previous call are reused for the same entries, and
+        ``cache`` then keeps only the entries rendered here.
+        """
+        previous = cache.snapshot()
+        current: Dict[int, Tuple[Any, Any]] = {}
+
+        def get_or_render(entry: Dict[str, Any]) -> Any:
+            key = id(entry)
+            hit = previous.get(key)
+            if hit is not None and hit[0] is entry:
+                item = hit[1]
+            else:
+                item = render(entry)
+            if item is not None:
+                current[key] = (entry, item)
+            return item
+
+        rendered: List[Any] = []
+        append = rendered.append
+        cap = self._max_history
+        if isinstance(cap, int) and cap > 0:
+            # Walk back from the newest entry so entries beyond the cap are never rendered
+            for entry in reversed(filtered_history):
+                item = get_or_render(entry)
+                if item is not None:
+                    append(item)
+                    if len(rendered) == cap:
+                        break
+            rendered.reverse()
+        else:
             for entry in filtered_history:
-                t = entry.get("type")
-                if t in (USER_MESSAGE, ASSISTANT_MESSAGE):
-                    if not self._include_history:
-                        continue
-                    role = "User" if t == USER_MESSAGE else "Assistant"
-                    history_lines.append(f"{role}: {entry.get('content', '')}")
-                elif t == ACTION:
-                    if not self._include_traces:
-                        continue
-                    history_lines.append(f"Action: {entry.get('tool')} with {entry.get('args')}")
-                elif t in (OBSERVATION, GLOBAL_OBSERVATION):
-                    if not self._include_traces:
-                        continue
-                    if t == GLOBAL_OBSERVATION and not self._include_global_updates:
-                        continue
-                    content = entry.get("content", "")
-                    if isinstance(content, dict):
-                        try:
-                            import json as _json
-                            content = _json.dumps(content)
-                        except Exception:
-                            content = str(content)
-                    content_s = str(content)
-                    if len(content_s) > self._obs_truncate_len:
-                        content_s = content_s[: self._obs_truncate_len] + "... (truncated)"
-                    history_lines.append(f"Observation: {content_s}")
-
-        # Apply max history cap (keep tail)
-        if isinstance(self._max_history, int) and self._max_history > 0:
-            history_lines = history_lines[-self._max_history:]
-
-        history_str = "\n" + "\n".join(history_lines) if history_lines else ""
-        
-        # Add termination guidance if enabled
-        termination_guidance = ""
-        if self.use_llm_termination:
-            termination_guidance = (
-                "\n\nIMPORTANT: Include 'is_final_step' in your JSON response:\n"
-                "- Set 'is_final_step': true if this action will COMPLETE the user's request (e.g., pure informational queries like 'list tables')\n"
-                "- Set 'is_final_step': false if more steps are needed AFTER this action (e.g., verification before modification)\n"
-                "- Omit 'is_final_step' only if uncertain (defaults to legacy terminal_tools behavior)"
-            )
-        
-        return (
-            f"{self.system_prompt}\n\n"
-            f"{plan_block}"
-            f"Available tools:\n{tools_str}\n\n"
-            f"Task: {task}\n"
-            f"{history_str}\n\n"
-            f"What should I do next? (Return JSON with thought/action/args or thought/final_answer)"
-            f"{termination_guidance}"
-        )
+                item = get_or_render(entry)
+                if item is not None:
+                    append(item)
+        cache.keep(current)
+        return rendered
+
+    def _render_text_entry(self, entry: Dict[str, Any]) -> Optional[str]:
+        """Render one history entry as a text-prompt line (None to skip it)."""
+        renderer = self._text_renderers.get(entry.get("type"))
+        return renderer(entry) if renderer is not None else None
+
+    def _render_chat_entry(self, entry: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """Render one history entry as a chat message (None to skip it)."""
+        renderer = self._chat_renderers.get(entry.get("type"))
+        return renderer(entry) if renderer is not None else None
+
+    def _observation_text(self, content: Any, dump_non_str: bool) -> str:
+        """Observation payload as truncated text; dicts (or all non-strings) as JSON."""
+        limit = self._obs_truncate_len
+        if isinstance(content, dict) or (dump_non_str and not isinstance(content, str)):
+            if _orjson is None and isinstance(content, (dict, list)):
+                # Pure-Python encoder: stop one character past the limit rather
+                # than serializing a large tool result in full
+                text = _clip_text(content, limit + 1, _OBS_ENCODER)
+            else:
+                try:
+                    text = _json_dumps(content)
+                except Exception:
+                    text = str(content)
+        else:
+            text = str(content)
+        if len(text) > limit:
+            text = text[:limit] + "... (truncated)"
+        return text
+
+    @staticmethod
+    def _text_conversation(entry: Dict[str, Any]) -> str:
+        role = "User" if entry.get("type") == USER_MESSAGE else "Assistant"
+        return f"{role}: {entry.get('content', '')}"
+
+    @staticmethod
+    def _text_action(entry: Dict[str, Any]) -> str:
+        return f"Action: {entry.get('tool')} with {entry.get('args')}"
+
+    def _text_observation(self, entry: Dict[str, Any]) -> str:
+        # Text mode JSON-encodes dict payloads only; other values use str()
+        return f"Observation: {self._observation_text(entry.get('content', ''), False)}"
+
+    @staticmethod
+    def _chat_conversation(entry: Dict[str, Any]) -> Dict[str, str]:
+        role = "user" if entry.get("type") == USER_MESSAGE else "assistant"
+        return {"role": role, "content": entry.get("content", "")}
+
+    @staticmethod
+    def _chat_action(entry: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "role": "assistant",
+            "content": f"Calling tool: {entry.get('tool')} with args: {_json_dumps(entry.get('args', {}))}"
+        }
+
+    def _chat_observation(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        # Function-calling mode JSON-encodes any non-string payload
+        return {"role": "user", "content": f"Tool result: {self._observation_text(entry.get('content', ''), True)}"}
 
     def _parse_react_response(self, text: str) -> Dict[str, Any]:
+        if "{" not in text:
+            self.logger.warning("No JSON found in response")
+            return {}
+        if text[0] == "{" and text[-1] == "}":
+            # Usually already sliced by _extract_json_from_markdown; skip the rescan
+            try:
+                return _json_loads(text)
+            except ValueError:
+                pass
         try:
-            m = re.search(r"\{[\s\S]*\}", text)
-            if not m:
+            json_str = _slice_json_object(text)
+            if json_str is None:
                 self.logger.warning("No JSON found in response")
                 return {}
             
-            json_str = m.group(0)
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            self.logger.error(f"JSON parsing failed: {e}")
-            self.logger.debug(f"Failed JSON string: {text[:500]}...")
+            return _json_loads(json_str)
+        except ValueError as e:
+            self.logger.error("JSON parsing failed: %s", e)
+            self.logger.debug("Failed JSON string: %s...", text[:500])
             # Return error indicator for recovery
             return {"_parse_error": str(e), "_raw_response": text[:1000]}
 
-    def _expected_args_for_tool(self, tool_name: Optional[str]) -> List[str]:
+    def _args_normalizer(self, tool_name: Any) -> Callable[[Any], Dict[str, Any]]:
+        """Return the args normalizer for ``tool_name``, building it on first use.
+        
+        The tool's expected arg names are resolved once; the normalizer then maps
+        positional lists to those names, injects MODEL_DIR and coerces precision
+        without looking at the tool schema again.
+        """
+        cacheable = isinstance(tool_name, str)
+        if cacheable:
+            normalizer = self._normalizers.get(tool_name)
+            if normalizer is not None:
+                return normalizer
+        expected = self._expected_args_for_tool(tool_name)
+        has_model_dir = "model_dir" in expected
+        has_precision = "precision" in expected
+        inject_model_dir = self._inject_model_dir
+
+        def normalize(tool_args: Any) -> Dict[str, Any]:
+            # Support dicts and positional lists by mapping to expected arg names
+            if isinstance(tool_args, list):
+                tool_args = dict(zip(expected, tool_args))
+            if not isinstance(tool_args, dict):
+                tool_args = {}
+            # Provide/override MODEL_DIR when value is missing, placeholder, or invalid
+            if has_model_dir:
+                tool_args = inject_model_dir(tool_name, tool_args, expected)
+            # Coerce precision to int when provided as string
+            if has_precision and isinstance(tool_args.get("precision"), str):
+                try:
+                    tool_args["precision"] = int(tool_args["precision"])
+                except Exception:
+                    tool_args.pop("precision", None)
+            return tool_args
+
+        if cacheable:
+            self._normalizers[tool_name] = normalize
+        return normalize
+
+    def _expected_args_for_tool(self, tool_name: Optional[str]) -> Tuple[str, ...]:
+        if not isinstance(tool_name, str):
+            return ()
+        return self._expected_args_by_name().get(tool_name, ())
+
+    def _expected_args_by_name(self) -> Dict[str, Tuple[str, ...]]:
+        """Expected arg names for every known tool, built once per tool set."""
+        cached = self._expected_args_cache
+        if cached is not None and cached[0] is self.tool_descriptions:
+            return cached[1]
+        by_name: Dict[str, Tuple[str, ...]] = {}
+        for desc in self.tool_descriptions:
+            name = desc.get("name")
+            if isinstance(name, str) and name not in by_name:
+                by_name[name] = tuple(desc.get("args", []))
         # Prefer introspection of actual tool args schema when available
-        if self._tool_objects and tool_name and tool_name in self._tool_objects:
-            tool_obj = self._tool_objects.get(tool_name)
+        for name, tool_obj in (self._tool_objects or {}).items():
             try:
-                schema = tool_obj.args_schema.model_json_schema()  # type: ignore[attr-defined]
-                return list((schema.get("properties") or {}).keys())
+                schema = cached_json_schema(tool_obj.args_schema)
+                by_name[name] = tuple((schema.get("properties") or {}).keys())
             except Exception:
                 pass
-        for desc in self.tool_descriptions:
-            if desc.get("name") == tool_name:
-                return desc.get("args", [])
-        return []
+        self._expected_args_cache = (self.tool_descriptions, by_name)
+        return by_name
     
     def _extract_json_from_markdown(self, text: str) -> str:
         """Extract JSON from markdown code blocks (```json...``` or ```...```)."""
@@ -932,14 +1602,16 @@ class ReActPlanner(BasePlanner):
             return text
         
         # Try to extract from ```json ... ``` blocks
-        json_match = re.search(r'```(?:json)?\s*(\{[\s\S]*?\})\s*```', text, re.DOTALL)
-        if json_match:
-            return json_match.group(1)
+        fence = _JSON_FENCE_RE.search(text) if "```" in text else None
+        if fence:
+            span = _json_object_span(text, fence.start(1))
+            if span is not None:
+                return text[span[0]:span[1]]
         
         # Try to extract any JSON object from the text
-        json_match = re.search(r'\{[\s\S]*\}', text)
-        if json_match:
-            return json_match.group(0)
+        json_str = _slice_json_object(text)
+        if json_str is not None:
+            return json_str
         
         # Return as-is if no JSON found
         return text
@@ -1000,31 +1672,34 @@ class ReActPlanner(BasePlanner):
             # Check for tool calls
             tool_calls = response.get("tool_calls")
             if tool_calls and len(tool_calls) > 0:
-                # Log ALL tool calls from LLM (before truncation)
-                tool_names_requested = [tc.get("function", {}).get("name", "unknown") for tc in tool_calls]
-                self.logger.info(
-                    "ReActPlanner: LLM requested %d tool calls: %s",
-                    len(tool_calls),
-                    tool_names_requested
-                )
-                
                 # Convert ALL tool calls to Actions (enables parallel execution!)
                 actions = []
+                expected_by_name = self._expected_args_by_name()
                 for tool_call in tool_calls:
                     func = tool_call.get("function", {})
                     tool_name = func.get("name")
                     args_str = func.get("arguments", "{}")
                     
                     try:
-                        tool_args = json.loads(args_str)
+                        tool_args = _json_loads(args_str)
                     except Exception:
                         tool_args = {}
                     
                     # Apply model_dir injection if needed
-                    tool_args = self._inject_model_dir(tool_name, tool_args)
+                    expected = expected_by_name.get(tool_name, ()) if isinstance(tool_name, str) else ()
+                    if "model_dir" in expected:
+                        tool_args = self._inject_model_dir(tool_name, tool_args, expected)
                     
                     actions.append(Action(tool_name=tool_name, tool_args=tool_args))
                 
+                # Log ALL tool calls from LLM (before truncation)
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(
+                        "ReActPlanner: LLM requested %d tool calls: %s",
+                        len(tool_calls),
+                        [tc.get("function", {}).get("name", "unknown") for tc in tool_calls]
+                    )
+                
                 # Optionally limit number of tool calls (e.g., force single-step)
                 original_count = len(actions)
                 if isinstance(self.max_parallel_tool_calls, int) and self.max_parallel_tool_calls > 0:
@@ -1044,11 +1719,12 @@ class ReActPlanner(BasePlanner):
                 if len(actions) == 1:
                     return actions[0]  # Single action (backward compatible)
                 else:
-                    self.logger.info(
-                        "ReActPlanner: Executing %d parallel tool calls: %s",
-                        len(actions),
-                        [a.tool_name for a in actions]
-                    )
+                    if self.logger.isEnabledFor(logging.INFO):
+                        self.logger.info(
+                            "ReActPlanner: Executing %d parallel tool calls: %s",
+                            len(actions),
+                            [a.tool_name for a in actions]
+                        )
                     return actions  # Parallel execution!
             
             # No tool calls, check for content (final answer)
@@ -1056,9 +1732,13 @@ class ReActPlanner(BasePlanner):
             if content:
                 # Try to parse as structured final_response if it's JSON
                 try:
-                    # Extract JSON from markdown code blocks if present
-                    json_str = self._extract_json_from_markdown(content)
-                    content_data = json.loads(json_str)
+                    if isinstance(content, dict):
+                        # Gateway already returned structured output; nothing to parse
+                        content_data = content
+                    else:
+                        # Extract JSON from markdown code blocks if present
+                        json_str = self._extract_json_from_markdown(content)
+                        content_data = _json_loads(json_str)
                     
                     if isinstance(content_data, dict) and "final_response" in content_data:
                         final_resp = content_data["final_response"]
@@ -1068,9 +1748,11 @@ class ReActPlanner(BasePlanner):
                             human_readable_summary=final_resp.get("human_readable_summary", "Task completed.")
                         )
                 except Exception as e:
-                    self.logger.debug(f"Failed to parse content as final_response JSON: {e}")
+                    self.logger.debug("Failed to parse content as final_response JSON: %s", e)
                 
                 # Legacy: simple text response
+                if not isinstance(content, str):
+                    content = _json_dumps(content)
                 return FinalResponse(
                     operation="display_message",
                     payload={"message": content},
@@ -1078,75 +1760,29 @@ class ReActPlanner(BasePlanner):
                 )
         
         # Fallback
-        return FinalResponse(
-            operation="display_message",
-            payload={"message": "Unable to determine next action.", "error": True},
-            human_readable_summary="Unable to determine next action."
-        )
+        return _unable_to_plan_response()
     
     def _build_function_calling_messages(self, task: str, history: List[Dict[str, Any]]) -> List[Dict[str, str]]:
         """Build message list for function calling mode."""
         # Filter history using hierarchical filter (worker gets current turn only)
-        filter_context = {"role": "worker"}
-        filtered_history = self.history_filter.filter_for_prompt(history, filter_context)
+        filtered_history = self._filter_history(history)
         
         # Inject strategic plan/context if available
-        strategic_plan = get_from_context("strategic_plan")
-        director_context = get_from_context("context") or ""
-        plan_block = ""
-        if strategic_plan:
-            try:
-                import json as _json
-                plan_block = f"\nSTRATEGIC PLAN (from orchestrator/manager):\n{_json.dumps(strategic_plan, indent=2)[:1500]}\n"
-            except Exception:
-                plan_block = f"\nSTRATEGIC PLAN (from orchestrator/manager):\n{str(strategic_plan)[:1500]}\n"
-        if director_context:
-            plan_block += f"\nDIRECTOR CONTEXT: {director_context}\n"
-
-        messages: List[Dict[str, str]] = [
-            {"role": "system", "content": f"{self.system_prompt}\n{plan_block}"}
-        ]
-
-        # Build gated history messages from filtered history then cap
-        history_msgs: List[Dict[str, str]] = []
-        if self._include_history or self._include_traces:
-            for entry in filtered_history:
-                t = entry.get("type")
-                if t in (USER_MESSAGE, ASSISTANT_MESSAGE):
-                    if not self._include_history:
-                        continue
-                    role = "user" if t == USER_MESSAGE else "assistant"
-                    history_msgs.append({"role": role, "content": entry.get("content", "")})
-                elif t == ACTION:
-                    if not self._include_traces:
-                        continue
-                    tool_name = entry.get("tool")
-                    args = entry.get("args", {})
-                    history_msgs.append({
-                        "role": "assistant",
-                        "content": f"Calling tool: {tool_name} with args: {json.dumps(args)}"
-                    })
-                elif t in (OBSERVATION, GLOBAL_OBSERVATION):
-                    if not self._include_traces:
-                        continue
-                    if t == GLOBAL_OBSERVATION and not self._include_global_updates:
-                        continue
-                    content = entry.get("content", "")
-                    if isinstance(content, str):
-                        s = content
-                    else:
-                        try:
-                            s = json.dumps(content)
-                        except Exception:
-                            s = str(content)
-                    if len(s) > self._obs_truncate_len:
-                        s = s[: self._obs_truncate_len] + "... (truncated)"
-                    history_msgs.append({"role": "user", "content": f"Tool result: {s}"})
-
-        if isinstance(self._max_history, int) and self._max_history > 0:
-            history_msgs = history_msgs[-self._max_history:]
+        plan_block = _plan_block(1500)
 
-        messages.extend(history_msgs)
+        # System prompt alone first (byte-stable, cacheable prefix); per-call plan and
+        # director context go in a separate system message
+        messages: List[Dict[str, str]] = [{"role": "system", "content": self.system_prompt}]
+        if plan_block:
+            messages.append({"role": "system", "content": plan_block.strip()})
+
+        # Build gated history messages from filtered history, capped to max history.
+        # Cached message dicts are copied so the prompt never aliases the cache.
+        if self._chat_renderers:
+            messages.extend(
+                dict(msg)
+                for msg in self._render_history(filtered_history, self._rendered_chat, self._render_chat_entry)
+            )
         
         # Only add task as final message if this is the first iteration (no tool results yet)
         # Re-adding task after tool results confuses the LLM into thinking more work is needed
@@ -1165,36 +1801,15 @@ class ReActPlanner(BasePlanner):
         If actual tool objects are available, derive JSON Schema from their
         Pydantic args_schema (types + required). Otherwise, fall back to the
         config-provided arg names as string-typed required fields.
+        
+        The result is built once per tool set and shared between calls, so it
+        must be treated as read-only.
         """
+        cached = self._tools_schema_cache
+        if cached is not None and cached[0] is self.tool_descriptions:
+            return cached[1]
         tools_schema: List[Dict[str, Any]] = []
 
-        def _prune_properties(props: Dict[str, Any]) -> Dict[str, Any]:
-            pruned: Dict[str, Any] = {}
-            for key, spec in (props or {}).items():
-                if not isinstance(spec, dict):
-                    pruned[key] = {"type": "string"}
-                    continue
-                entry: Dict[str, Any] = {}
-                t = spec.get("type")
-                if isinstance(t, str):
-                    entry["type"] = t
-                elif isinstance(t, list):
-                    # pick a reasonable type if union
-                    entry["type"] = next((x for x in t if isinstance(x, str)), "string")
-                else:
-                    entry["type"] = "string"
-                
-                # For array types, preserve the items field (required for OpenAI function calling)
-                if entry.get("type") == "array" and "items" in spec:
-                    entry["items"] = spec["items"]
-                
-                if spec.get("description"):
-                    entry["description"] = spec.get("description")
-                if isinstance(spec.get("enum"), list):
-                    entry["enum"] = spec["enum"]
-                pruned[key] = entry
-            return pruned
-
         if self._tool_objects:
             for desc in self.tool_descriptions:
                 name = desc.get("name")
@@ -1202,9 +1817,9 @@ class ReActPlanner(BasePlanner):
                 tool_obj = self._tool_objects.get(name)
                 if tool_obj and getattr(tool_obj, "args_schema", None):
                     try:
-                        schema = tool_obj.args_schema.model_json_schema()  # type: ignore[attr-defined]
-                        properties = _prune_properties(schema.get("properties", {}))
-                        required = schema.get("required", []) or []
+                        schema = cached_json_schema(tool_obj.args_schema)  # type: ignore[union-attr]
+                        properties = _prune_schema_properties(schema.get("properties", {}))
+                        required = list(schema.get("required", []) or [])
                         tools_schema.append({
                             "type": "function",
                             "function": {
@@ -1240,10 +1855,14 @@ class ReActPlanner(BasePlanner):
                 },
             })
 
+        self._tools_schema_cache = (self.tool_descriptions, tools_schema)
         return tools_schema
 
     # Public hook for factory to inject tool objects
     def configure_tools(self, tools: Dict[str, Any]) -> None:
+        self._tools_schema_cache = None
+        self._expected_args_cache = None
+        self._normalizers.clear()
         try:
             if isinstance(tools, dict):
                 self._tool_objects = dict(tools)
@@ -1253,27 +1872,36 @@ class ReActPlanner(BasePlanner):
         except Exception:
             self._tool_objects = None
     
-    def _inject_model_dir(self, tool_name: Optional[str], tool_args: Dict[str, Any]) -> Dict[str, Any]:
+    def refresh_env(self) -> None:
+        """Re-read MODEL_DIR from the environment (it is cached at construction)."""
+        self._env_model_dir = os.environ.get("MODEL_DIR")
+
+    def _inject_model_dir(
+        self,
+        tool_name: Optional[str],
+        tool_args: Dict[str, Any],
+        expected: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
         """Inject MODEL_DIR environment variable if needed.
         
-        Matches the validation logic from text-based mode (lines 396-414).
+        Used by both text-based and function-calling modes. ``expected`` may be
+        passed when the caller has already resolved the tool's arg names.
         """
-        expected = self._expected_args_for_tool(tool_name)
+        if expected is None:
+            expected = self._expected_args_for_tool(tool_name)
         if "model_dir" in expected:
-            env_model_dir = os.environ.get("MODEL_DIR")
+            env_model_dir = self._env_model_dir
             md = tool_args.get("model_dir")
-            placeholder_vals = {"model_dir", "<model_dir>", "${model_dir}", "${MODEL_DIR}"}
             
             needs_inject = (
                 md is None
-                or (isinstance(md, str) and md.strip() in placeholder_vals)
+                or (isinstance(md, str) and md.strip() in _MODEL_DIR_PLACEHOLDERS)
             )
             
-            # Validate directory existence (same as text-based mode)
+            # If provided but not a directory, prefer env
             if not needs_inject and isinstance(md, str):
                 try:
-                    import os as _os
-                    if not _os.path.isdir(md):
+                    if not os.path.isdir(md):
                         needs_inject = True
                         self.logger.debug(
                             "ReActPlanner._inject_model_dir: '%s' is not a valid directory, using env MODEL_DIR",
@@ -1292,6 +1920,24 @@ class ReActPlanner(BasePlanner):
         return tool_args
 
 
+def _looks_like_calculation(t: str) -> bool:
+    """MathPlanner heuristic on a lowercased task."""
+    if not t:
+        return False
+    # Contains digits with math operators or caret/power words
+    if _CALC_OPERATOR_RE.search(t) and (
+        _DIGIT_RE.search(t)
+        # str.isdigit also accepts digits \d does not, e.g. superscripts
+        or (not t.isascii() and any(ch.isdigit() for ch in t))
+    ):
+        return True
+    if _CALC_KEYWORD_RE.search(t):
+        return True
+    # Numbers present with query verbs often imply calc ("calculate", "compute"
+    # and "evaluate" are already calc keywords above)
+    return bool(_CALC_QUERY_RE.search(t) and _NUMBER_RE.search(t))
+
+
 class MathPlanner(BasePlanner):
     """Heuristic planner for math Q&A and calculations.
 
@@ -1300,37 +1946,126 @@ class MathPlanner(BasePlanner):
     """
 
     def __init__(self) -> None:
-        from ..logging import get_logger
-        self.logger = get_logger()
+        self.logger = _planner_logger()
 
     def plan(self, task_description: str, history: List[Dict[str, Any]]) -> Union[Action, FinalResponse]:
         t = (task_description or "").strip().lower()
         is_calc = self._looks_like_calculation(t)
         if self.logger.isEnabledFor(logging.DEBUG):
-            self.logger.debug(f"MathPlanner decision is_calc={is_calc} task='{task_description}'")
+            self.logger.debug("MathPlanner decision is_calc=%s task='%s'", is_calc, task_description)
         if is_calc:
             return Action(tool_name="calculator", tool_args={"expression": task_description})
         return Action(tool_name="math_qa", tool_args={"question": task_description})
 
-    def _looks_like_calculation(self, t: str) -> bool:
-        if not t:
-            return False
-        # Contains digits with math operators or caret/power words
-        if any(op in t for op in ["+", "-", "*", "×", "x", "/", "÷", "%", "^"]):
-            if any(ch.isdigit() for ch in t):
-                return True
-        keywords = [
-            "plus", "minus", "times", "multiplied by", "divided by", "over", "mod", "modulo",
-            "remainder", "percent of", "% of", "power of", "raised to", "squared", "cubed",
-            "sqrt", "square root", "log", "ln", "sin", "cos", "tan", "calculate", "compute", "evaluate",
-        ]
-        if any(k in t for k in keywords):
-            return True
-        # Numbers present with query verbs often imply calc
-        if re.search(r"\b\d+(?:[\.\d]*)?\b", t):
-            if any(k in t for k in ["calculate", "compute", "evaluate", "what is", "what's", "solve"]):
-                return True
-        return False
+    @staticmethod
+    def _looks_like_calculation(t: str) -> bool:
+        return _looks_like_calculation(t)
+
+
+# StrategicDecomposerPlanner worker keywords (substring matches); validator wins
+# over dax, so they stay two patterns rather than one leftmost-match alternation
+_PICK_VALIDATOR_RE = re.compile("validate|lint|integrity|consistency")
+_PICK_DAX_RE = re.compile("dax|measure|calculation|kpi")
+
+
+def _pick_worker_for_text(text: str, worker_keys: FrozenSet[str], default_worker: str) -> str:
+    """StrategicDecomposerPlanner worker heuristic for a lowercased phase text."""
+    if _PICK_VALIDATOR_RE.search(text):
+        return "validator" if "validator" in worker_keys else default_worker
+    if _PICK_DAX_RE.search(text):
+        return "dax" if "dax" in worker_keys else default_worker
+    # Default for schema-related analysis/editing
+    return "schema" if "schema" in worker_keys else default_worker
+
+
+def _last_content_of_type(history: List[Dict[str, Any]], entry_type: str) -> Any:
+    """Content of the newest history entry of ``entry_type`` (None if absent).
+
+    Planners receive history as a plain list rebuilt per call, so this walks it
+    from the end by index and stops at the first match.
+    """
+    for idx in range(len(history) - 1, -1, -1):
+        entry = history[idx]
+        try:
+            if entry["type"] == entry_type:
+                return entry.get("content")
+        except (TypeError, KeyError):
+            continue
+    return None
+
+
+def _render_synthesis(content: Dict[str, Any]) -> str:
+    """Summary, actual data and worker results of a synthesis entry ("" if none)."""
+    # Build comprehensive output including both summary and actual data
+    output_parts = []
+    
+    # Add synthesized summary
+    synthesized_summary = content.get("synthesized_summary")
+    if not synthesized_summary:
+        # Try to get from full_result
+        full_result = content.get("full_result", {})
+        if isinstance(full_result, dict):
+            synthesized_summary = full_result.get("human_readable_summary") or full_result.get("summary")
+    
+    if synthesized_summary:
+        output_parts.append(f"Summary: {synthesized_summary}")
+    
+    # Add actual data (structured data for planning)
+    actual_data = content.get("actual_data") or content.get("payload")
+    if actual_data:
+        try:
+            data_str = _json_dumps(actual_data, indent=True) if isinstance(actual_data, dict) else str(actual_data)
+            output_parts.append(f"Actual Data:\n{data_str}")
+        except Exception:
+            output_parts.append(f"Actual Data: {str(actual_data)}")
+    
+    # Raw worker results only add context when there is no actual data; they
+    # are prompt-only, so keep them compact and capped
+    worker_results = content.get("worker_results", [])
+    if worker_results and not actual_data:
+        if _orjson is None and isinstance(worker_results, (dict, list)):
+            results_str = _clip_text(worker_results, _WORKER_RESULTS_LIMIT)
+        else:
+            try:
+                results_str = _json_dumps(worker_results)[:_WORKER_RESULTS_LIMIT]
+            except Exception:
+                results_str = ""
+        if results_str:
+            output_parts.append(f"Worker Results:\n{results_str}")
+    
+    return "\n\n".join(output_parts)
+
+
+def _collect_synthesis(content: Any, synthesized_outputs: List[str], previous_outputs: List[str]) -> None:
+    """Synthesized output from the synthesizer agent (global ``synthesis`` entry)."""
+    if isinstance(content, dict):
+        synthesized = _render_synthesis(content)
+        if synthesized:
+            synthesized_outputs.append(synthesized)
+    elif isinstance(content, str):
+        synthesized_outputs.append(content)
+
+
+def _collect_manager_output(content: Any, synthesized_outputs: List[str], previous_outputs: List[str]) -> None:
+    """Regular manager output, only collected while nothing has been synthesized."""
+    if synthesized_outputs:
+        return
+    if isinstance(content, dict):
+        summary = content.get("human_readable_summary") or content.get("summary", "")
+        if summary:
+            previous_outputs.append(str(summary))
+    elif isinstance(content, str):
+        previous_outputs.append(content)
+
+
+# History entry types treated as regular (non-synthesized) manager outputs
+_REGULAR_OUTPUT_TYPES = frozenset({FINAL, ASSISTANT_MESSAGE, "manager_result"})
+
+# History entry type -> collector used by StrategicDecomposerPlanner._collect_previous_outputs
+_PREVIOUS_OUTPUT_HANDLERS: Dict[str, Callable[[Any, List[str], List[str]], None]] = {
+    SYNTHESIS: _collect_synthesis,
+    **dict.fromkeys(_REGULAR_OUTPUT_TYPES, _collect_manager_output),
+}
 
 
 class StrategicDecomposerPlanner(BasePlanner):
@@ -1361,13 +2096,18 @@ class StrategicDecomposerPlanner(BasePlanner):
         history_filter: Optional[HistoryFilter] = None,
     ) -> None:
         self.worker_keys = worker_keys or []
+        self._worker_key_set = frozenset(self.worker_keys)
         self.default_worker = default_worker or (self.worker_keys[0] if self.worker_keys else "")
         self.llm = inference_gateway
         self.planning_prompt = planning_prompt or self._default_planning_prompt()
+        # Worker keys and prompt are fixed after construction; render them once
+        self._workers_list = ", ".join(self.worker_keys)
+        # Replace {worker_keys} placeholder (use replace to avoid KeyError with JSON braces in prompt)
+        self._rendered_prompt = self.planning_prompt.replace("{worker_keys}", self._workers_list)
         self.manager_worker_key = manager_worker_key  # e.g., "powerbi-analysis", "powerbi-designer"
-        from ..policies.history_filters import ManagerHistoryFilter
         self.history_filter = history_filter or ManagerHistoryFilter()
-        self.logger = get_logger()
+        self.logger = _planner_logger()
+        self._response_cache = _make_response_cache()
     
     def _default_planning_prompt(self) -> str:
         return """You are a manager planner creating execution steps for a domain-specific task.
@@ -1396,7 +2136,7 @@ Return JSON:
         if not upstream:
             # Try to locate in history (manager added it earlier)
             try:
-                upstream = next((h.get("content") for h in reversed(history) if h.get("type") == "strategic_plan"), None)
+                upstream = _last_content_of_type(history, "strategic_plan")
             except Exception:
                 upstream = None
 
@@ -1412,8 +2152,9 @@ Return JSON:
         if isinstance(plan_obj, dict):
             phases_in = plan_obj.get("phases") or []
         
-        # Log when no phases found (this is the issue reported)
-        if not phases_in:
+        # Log when no phases found (this is the issue reported); the history scan
+        # and upstream preview are only worth doing when debug output is on
+        if not phases_in and self.logger.isEnabledFor(logging.DEBUG):
             has_context = upstream is not None
             has_history = any(h.get("type") == "strategic_plan" for h in history)
             self.logger.debug(
@@ -1425,127 +2166,36 @@ Return JSON:
             )
             if upstream:
                 try:
-                    import json as _json
-                    upstream_preview = _json.dumps(upstream, indent=2)[:300] if isinstance(upstream, dict) else str(upstream)[:300]
+                    upstream_preview = _json_dumps(upstream, indent=True)[:300] if isinstance(upstream, dict) else str(upstream)[:300]
                     self.logger.debug("StrategicDecomposerPlanner: upstream structure preview=%s", upstream_preview)
                 except Exception:
                     pass
 
+        # Orchestrator phase index for this manager (selects the phase and filters history)
+        phase_index = get_from_context("orchestrator_phase_index")
+
         # Extract orchestrator phase assigned to this manager
         orchestrator_phase = None
         if self.manager_worker_key and phases_in:
-            # Find phase(s) where worker matches this manager's worker key
-            matching_phases = [p for p in phases_in if str(p.get("worker", "")).strip() == self.manager_worker_key]
-            if matching_phases:
-                # Use phase index from request context to select the correct phase
-                phase_index = get_from_context("orchestrator_phase_index")
-                if phase_index is not None and isinstance(phase_index, int) and 0 <= phase_index < len(matching_phases):
-                    orchestrator_phase = matching_phases[phase_index]
-                    self.logger.debug(
-                        "StrategicDecomposerPlanner: Using phase index %d/%d for manager_worker_key=%s, phase='%s'",
-                        phase_index + 1,
-                        len(matching_phases),
-                        self.manager_worker_key,
-                        orchestrator_phase.get("name", "unnamed")
-                    )
-                else:
-                    # Fallback: use first matching phase if index not available or invalid
-                    orchestrator_phase = matching_phases[0]
-                    if phase_index is not None:
-                        self.logger.warning(
-                            "StrategicDecomposerPlanner: Invalid phase_index=%s (expected 0-%d), using first phase",
-                            phase_index,
-                            len(matching_phases) - 1
-                        )
-                
+            # Find the phase where worker matches this manager's worker key, using
+            # the phase index from request context to select the correct one
+            orchestrator_phase = self._select_orchestrator_phase(phases_in, phase_index)
+            if orchestrator_phase is not None:
                 # Combine task_description with orchestrator phase info
                 if orchestrator_phase.get("goals"):
                     task_description = orchestrator_phase.get("goals", task_description)
 
         # Filter history using hierarchical filter (manager gets phase-relevant context only)
-        phase_index = get_from_context("orchestrator_phase_index")
         filter_context = {
             "role": "manager",
             "phase_id": phase_index,
-            "previous_phase_id": phase_index - 1 if phase_index is not None and phase_index > 0 else None,
+            "previous_phase_id": phase_index - 1 if isinstance(phase_index, int) and phase_index > 0 else None,
         }
         filtered_history = self.history_filter.filter_for_prompt(history, filter_context)
         
         # Extract previous manager outputs from filtered history
         # Priority: synthesized outputs from synthesizer agent > regular manager outputs
-        previous_outputs = []
-        synthesized_outputs = []
-        
-        for entry in reversed(filtered_history):
-            if not isinstance(entry, dict):
-                continue
-                
-            entry_type = entry.get("type", "")
-            
-            # Look for synthesized outputs first (from synthesizer agent)
-            # These are stored as global updates with type="synthesis"
-            if entry_type == SYNTHESIS:
-                content = entry.get("content", {})
-                if isinstance(content, dict):
-                    # Build comprehensive output including both summary and actual data
-                    output_parts = []
-                    
-                    # Add synthesized summary
-                    synthesized_summary = content.get("synthesized_summary")
-                    if not synthesized_summary:
-                        # Try to get from full_result
-                        full_result = content.get("full_result", {})
-                        if isinstance(full_result, dict):
-                            synthesized_summary = full_result.get("human_readable_summary") or full_result.get("summary")
-                    
-                    if synthesized_summary:
-                        output_parts.append(f"Summary: {synthesized_summary}")
-                    
-                    # Add actual data (structured data for planning)
-                    actual_data = content.get("actual_data") or content.get("payload")
-                    if actual_data:
-                        import json
-                        try:
-                            data_str = json.dumps(actual_data, indent=2) if isinstance(actual_data, dict) else str(actual_data)
-                            output_parts.append(f"Actual Data:\n{data_str}")
-                        except Exception:
-                            output_parts.append(f"Actual Data: {str(actual_data)}")
-                    
-                    # Add worker results for context
-                    worker_results = content.get("worker_results", [])
-                    if worker_results:
-                        import json
-                        try:
-                            results_str = json.dumps(worker_results, indent=2)
-                            output_parts.append(f"Worker Results:\n{results_str}")
-                        except Exception:
-                            pass
-                    
-                    if output_parts:
-                        synthesized_outputs.append("\n\n".join(output_parts))
-                elif isinstance(content, str):
-                    synthesized_outputs.append(content)
-            
-            # Also collect regular manager outputs as fallback
-            if entry_type in [FINAL, ASSISTANT_MESSAGE, "manager_result"]:
-                content = entry.get("content", {})
-                if isinstance(content, dict):
-                    summary = content.get("human_readable_summary") or content.get("summary", "")
-                    if summary:
-                        previous_outputs.append(str(summary))
-                elif isinstance(content, str):
-                    previous_outputs.append(content)
-            
-            # Limit to avoid token overflow (prioritize synthesized)
-            if synthesized_outputs:
-                if len(synthesized_outputs) >= 2:
-                    break
-            else:
-                if len(previous_outputs) >= 3:
-                    break
-        
-        # Prefer synthesized outputs, fall back to regular outputs
-        final_previous_outputs = synthesized_outputs if synthesized_outputs else previous_outputs
+        final_previous_outputs, has_synthesized = self._collect_previous_outputs(filtered_history)
 
         # If LLM is available and we have orchestrator phase, create steps using LLM
         # Reuse StrategicPlanner's pattern but with manager-specific context
@@ -1554,7 +2204,7 @@ Return JSON:
                 "StrategicDecomposerPlanner using LLM to create steps: manager_worker_key=%s, orchestrator_phase=%s, has_synthesized_outputs=%s",
                 self.manager_worker_key,
                 orchestrator_phase.get("name", "unnamed"),
-                len(synthesized_outputs) > 0
+                has_synthesized
             )
             llm_result = self._create_steps_with_llm(
                 task_description, orchestrator_phase, final_previous_outputs, plan_obj, history
@@ -1574,22 +2224,13 @@ Return JSON:
 
         # Fallback: Decompose orchestrator phases using heuristics (original behavior)
         phases_out: List[Dict[str, Any]] = []
-        def _pick_worker(name: str, goals: str, notes: str) -> str:
-            text = f"{name} {goals} {notes}".lower()
-            if any(k in text for k in ["validate", "lint", "integrity", "consistency"]):
-                return "validator" if "validator" in self.worker_keys else self.default_worker
-            if any(k in text for k in ["dax", "measure", "measures", "calculation", "kpi"]):
-                return "dax" if "dax" in self.worker_keys else self.default_worker
-            # Default for schema-related analysis/editing
-            return "schema" if "schema" in self.worker_keys else self.default_worker
-
         for ph in phases_in:
             name = str((ph or {}).get("name", "Phase")).strip()
             goals = str((ph or {}).get("goals", "")).strip()
             notes = str((ph or {}).get("notes", "")).strip()
             worker = (ph or {}).get("worker")
-            if worker not in self.worker_keys:
-                worker = _pick_worker(name, goals, notes)
+            if not isinstance(worker, str) or worker not in self._worker_key_set:
+                worker = self._pick_worker(name, goals, notes)
             phases_out.append({
                 "name": name,
                 "worker": worker,
@@ -1608,7 +2249,7 @@ Return JSON:
             }]
 
         primary_worker = phases_out[0].get("worker") or self.default_worker
-        if primary_worker not in self.worker_keys and self.worker_keys:
+        if primary_worker not in self._worker_key_set and self.worker_keys:
             primary_worker = self.worker_keys[0]
 
         # Compose a local plan object for downstream workers
@@ -1620,12 +2261,11 @@ Return JSON:
         }
 
         # Log and return as Action to the primary worker; manager will run follow-ups
-        try:
-            if self.logger.isEnabledFor(logging.DEBUG):
-                import json as _json
-                self.logger.debug("StrategicDecomposerPlanner.local_plan=%s", _json.dumps(local_plan, indent=2)[:800])
-        except Exception:
-            pass
+        if self.logger.isEnabledFor(logging.DEBUG):
+            try:
+                self.logger.debug("StrategicDecomposerPlanner.local_plan=%s", _json_dumps(local_plan, indent=True)[:800])
+            except Exception:
+                pass
 
         return Action(
             tool_name=str(primary_worker),
@@ -1635,6 +2275,99 @@ Return JSON:
             },
         )
     
+    async def aplan(self, task_description: str, history: List[Dict[str, Any]]) -> Union[Action, FinalResponse]:
+        """Awaitable ``plan`` so several managers can plan concurrently.
+
+        ``plan`` runs in a worker thread with a copy of the current request
+        context, so an orchestrator can ``asyncio.gather`` one ``aplan`` per
+        manager and overlap their blocking LLM calls.
+        """
+        return await asyncio.to_thread(self.plan, task_description, history)
+    
+    def _phase_matches(self, phase: Dict[str, Any]) -> bool:
+        worker = phase.get("worker", "")
+        return (worker if type(worker) is str else str(worker)).strip() == self.manager_worker_key
+
+    def _select_orchestrator_phase(
+        self,
+        phases_in: List[Dict[str, Any]],
+        phase_index: Any,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the ``phase_index``-th phase assigned to this manager.
+        
+        Falls back to the first matching phase when the index is missing or out of
+        range; None when no phase matches. Stops scanning once the phase is found.
+        """
+        valid_index = isinstance(phase_index, int) and phase_index >= 0
+        # Without an index only the first match is needed; an invalid index needs
+        # the full match count for the warning below
+        target = phase_index if valid_index else (0 if phase_index is None else -1)
+        first = None
+        count = 0
+        for phase in phases_in:
+            if not self._phase_matches(phase):
+                continue
+            if first is None:
+                first = phase
+            if count == target:
+                if valid_index and self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        "StrategicDecomposerPlanner: Using phase index %d/%d for manager_worker_key=%s, phase='%s'",
+                        phase_index + 1,
+                        sum(1 for p in phases_in if self._phase_matches(p)),
+                        self.manager_worker_key,
+                        phase.get("name", "unnamed")
+                    )
+                return phase
+            count += 1
+        
+        # Fallback: use first matching phase if index not available or invalid
+        if first is not None and phase_index is not None:
+            self.logger.warning(
+                "StrategicDecomposerPlanner: Invalid phase_index=%s (expected 0-%d), using first phase",
+                phase_index,
+                count - 1
+            )
+        return first
+    
+    def _collect_previous_outputs(self, filtered_history: List[Dict[str, Any]]) -> Tuple[List[str], bool]:
+        """Collect previous manager outputs, newest first.
+        
+        Returns up to 2 synthesized outputs if any are found, otherwise up to 3
+        regular manager outputs, plus whether the outputs are synthesized. Once a
+        synthesized output is found, regular outputs are no longer collected.
+        """
+        previous_outputs: List[str] = []
+        synthesized_outputs: List[str] = []
+        
+        for entry in reversed(filtered_history):
+            # Entries are dicts in practice; a subscript skips non-dicts and
+            # untyped entries without a separate isinstance check
+            try:
+                entry_type = entry["type"]
+            except (TypeError, KeyError):
+                continue
+            
+            # Synthesized outputs (from the synthesizer agent) take priority over
+            # regular manager outputs, which are only kept as a fallback
+            handler = _PREVIOUS_OUTPUT_HANDLERS.get(entry_type)
+            if handler is None:
+                continue
+            handler(entry.get("content", {}), synthesized_outputs, previous_outputs)
+            
+            # Limit to avoid token overflow (prioritize synthesized)
+            if synthesized_outputs:
+                if len(synthesized_outputs) >= 2:
+                    break
+            else:
+                if len(previous_outputs) >= 3:
+                    break
+        
+        # Prefer synthesized outputs, fall back to regular outputs
+        if synthesized_outputs:
+            return synthesized_outputs, True
+        return previous_outputs, False
+    
     def _create_steps_with_llm(
         self,
         task_description: str,
@@ -1644,7 +2377,7 @@ Return JSON:
         history: List[Dict[str, Any]],
     ) -> Optional[Action]:
         """Create steps using LLM - reuses StrategicPlanner's pattern with manager-specific context."""
-        workers_list = ", ".join(self.worker_keys)
+        workers_list = self._workers_list
         
         self.logger.info(
             "StrategicDecomposerPlanner._create_steps_with_llm: Invoking LLM with orchestrator_phase=%s, previous_outputs=%d",
@@ -1652,41 +2385,46 @@ Return JSON:
             len(previous_outputs)
         )
         
-        # Replace {worker_keys} placeholder (use replace to avoid KeyError with JSON braces in prompt)
-        prompt = self.planning_prompt.replace("{worker_keys}", workers_list)
-        messages = [{"role": "system", "content": prompt}]
+        messages = [{"role": "system", "content": self._rendered_prompt}]
         
-        # Build context similar to StrategicPlanner but with manager-specific info
-        context_parts = []
+        # Build context similar to StrategicPlanner but with manager-specific info.
+        # Parts go straight into one buffer; each part after the first is
+        # preceded by a blank-line separator.
+        context = StringIO()
+        write = context.write
         
         # Add orchestrator phase context (manager-specific)
         phase_name = orchestrator_phase.get("name", "")
         phase_goals = orchestrator_phase.get("goals", task_description)
         phase_notes = orchestrator_phase.get("notes", "")
-        context_parts.append(f"ORCHESTRATOR PHASE:\nName: {phase_name}\nGoals: {phase_goals}")
+        write(f"ORCHESTRATOR PHASE:\nName: {phase_name}\nGoals: {phase_goals}")
         if phase_notes:
-            context_parts.append(f"Notes: {phase_notes}")
+            write("\n\n")
+            write(f"Notes: {phase_notes}")
         
         # Add previous manager outputs (manager-specific) - include actual data
         if previous_outputs:
-            context_parts.append("\nPREVIOUS MANAGER OUTPUTS (INCLUDES ACTUAL DATA):")
-            context_parts.append("IMPORTANT: The following outputs contain ACTUAL DATA from previous manager analysis.")
-            context_parts.append("Use this data directly in your step planning - do not assume data needs to be re-queried.")
+            write("\n\n")
+            write("\nPREVIOUS MANAGER OUTPUTS (INCLUDES ACTUAL DATA):")
+            write("\n\n")
+            write("IMPORTANT: The following outputs contain ACTUAL DATA from previous manager analysis.")
+            write("\n\n")
+            write("Use this data directly in your step planning - do not assume data needs to be re-queried.")
             for idx, output in enumerate(reversed(previous_outputs), 1):
                 # Include full output (may contain actual data) - don't truncate too much
-                context_parts.append(f"\nPrevious Manager Output {idx}:\n{str(output)[:5000]}")
+                write("\n\n")
+                write(f"\nPrevious Manager Output {idx}:\n{str(output)[:5000]}")
         
         # Add data model context (same as StrategicPlanner)
         try:
-            from ..services.request_context import get_from_context as _ctx
-            data_model_context = _ctx("data_model_context")
+            data_model_context = get_from_context("data_model_context")
             if data_model_context:
-                context_parts.append(f"\nDATA MODEL CONTEXT:\n{str(data_model_context)[:2000]}")
+                write("\n\n")
+                write(f"\nDATA MODEL CONTEXT:\n{str(data_model_context)[:2000]}")
         except Exception:
             pass
         
-        if context_parts:
-            messages.append({"role": "system", "content": "\n\n".join(context_parts)})
+        messages.append({"role": "system", "content": context.getvalue()})
         
         # Add task (same pattern as StrategicPlanner)
         messages.append({
@@ -1708,21 +2446,20 @@ Return JSON with phases array (use "phases" not "steps").
 """,
         })
         
-        # Reuse StrategicPlanner's LLM invocation and parsing pattern
-        response = self.llm.invoke(messages)
+        # Reuse StrategicPlanner's LLM invocation and parsing pattern; the cache
+        # key covers phase, previous outputs, prompt and worker list
+        response = _invoke_llm(self.llm, self._response_cache, messages)
         
         # Parse using same pattern as StrategicPlanner
-        import json
-        import re
         try:
             # Look for "phases" instead of "plan" for manager steps
-            match = re.search(r'\{[\s\S]*"phases"[\s\S]*\}', response)
-            if not match:
+            match = _json_object_containing(response, '"phases"')
+            if match is None:
                 # Fallback: try to find any JSON with plan
-                match = re.search(r'\{[\s\S]*"plan"[\s\S]*\}', response)
+                match = _json_object_containing(response, '"plan"')
             
-            if match:
-                parsed = json.loads(match.group(0))
+            if match is not None:
+                parsed = _json_loads(match)
                 # Support both "phases" (manager format) and "plan.phases" (orchestrator format)
                 plan_data = parsed.get("plan", {}) if "plan" in parsed and "phases" not in parsed else parsed
                 phases_out = plan_data.get("phases", []) or plan_data.get("steps", [])
@@ -1731,7 +2468,7 @@ Return JSON with phases array (use "phases" not "steps").
                     # Validate and correct workers (same as StrategicPlanner)
                     for ph in phases_out:
                         worker = ph.get("worker", "")
-                        if worker and worker not in self.worker_keys:
+                        if worker and (not isinstance(worker, str) or worker not in self._worker_key_set):
                             ph["worker"] = self._pick_worker(
                                 ph.get("name", ""),
                                 ph.get("goals", ""),
@@ -1739,7 +2476,7 @@ Return JSON with phases array (use "phases" not "steps").
                             )
                     
                     primary_worker = plan_data.get("primary_worker") or (phases_out[0].get("worker") if phases_out else self.default_worker)
-                    if primary_worker not in self.worker_keys:
+                    if not isinstance(primary_worker, str) or primary_worker not in self._worker_key_set:
                         primary_worker = self.default_worker
                     
                     local_plan = {
@@ -1763,19 +2500,52 @@ Return JSON with phases array (use "phases" not "steps").
                         },
                     )
         except Exception as e:
-            self.logger.warning(f"Failed to parse step plan: {e}, falling back to decomposition")
+            self.logger.warning("Failed to parse step plan: %s, falling back to decomposition", e)
         
         # Fallback: return single step (will be handled by decomposition logic below)
         return None
     
     def _pick_worker(self, name: str, goals: str, notes: str) -> str:
         """Pick worker based on heuristics."""
-        text = f"{name} {goals} {notes}".lower()
-        if any(k in text for k in ["validate", "lint", "integrity", "consistency"]):
-            return "validator" if "validator" in self.worker_keys else self.default_worker
-        if any(k in text for k in ["dax", "measure", "measures", "calculation", "kpi"]):
-            return "dax" if "dax" in self.worker_keys else self.default_worker
-        return "schema" if "schema" in self.worker_keys else self.default_worker
+        return _pick_worker_for_text(
+            f"{name} {goals} {notes}".lower(), self._worker_key_set, self.default_worker
+        )
+
+
+# Default ManagerScriptPlanner prompt, split around the {worker_catalog} placeholder
+_SCRIPT_PROMPT_PREFIX = (
+    "You are a tactical Power BI manager. Your director gives you one goal at a time.\n"
+    "You must respond with a STRICT JSON object containing a 'thought' string and a 'script' array.\n\n"
+    "Each script entry must include: name, worker (from the list below), tool_name (exact tool), args (object), "
+    "and MAY include execution_mode when needed.\n"
+    "Workers and their tools:\n"
+)
+_SCRIPT_PROMPT_SUFFIX = (
+    "\n\n"
+    "Rules:\n"
+    "1. Think like a programmer writing a script.\n"
+    "2. Ensure prerequisites are satisfied before any dependent tool (e.g., gather data before validation).\n"
+    "3. Keep the script minimal and ordered. No speculative or redundant calls.\n"
+    "4. Only use the tools listed for each worker.\n"
+    "5. Choose an execution mode per step:\n"
+    "   • 'direct' (default) when every argument is concrete and the worker can run it deterministically.\n"
+    "   • 'guided' when the worker must reason, fill placeholders, or iterate on freshly retrieved data. "
+    "Provide the best available hints in args, but expect the worker to adapt.\n"
+    "6. Never delegate planning blindly – if you set execution_mode='guided', explain why in the step notes.\n\n"
+    "Example output:\n"
+    "{\n"
+    "  \"thought\": \"List current relationships, then add the requested one.\",\n"
+    "  \"script\": [\n"
+    "    {\"name\": \"List relationships\", \"worker\": \"schema\", \"tool_name\": \"list_relationships\", \"args\": {}, \"execution_mode\": \"direct\"},\n"
+    "    {\"name\": \"Count columns per table\", \"worker\": \"schema\", \"tool_name\": \"list_columns\", \"args\": {\"table\": \"<table_from_previous>\"}, \"execution_mode\": \"guided\", \"notes\": \"Worker must iterate over each table returned earlier.\"}\n"
+    "  ]\n"
+    "}\n"
+)
+
+
+def _format_tool_args(args: Any) -> str:
+    """Tool argument names for the worker catalog (lists comma-joined)."""
+    return ", ".join(args) if isinstance(args, list) else str(args)
 
 
 class ManagerScriptPlanner(BasePlanner):
@@ -1797,11 +2567,16 @@ class ManagerScriptPlanner(BasePlanner):
     ) -> None:
         self.worker_specs = self._normalize_worker_specs(worker_specs)
         self.worker_keys = [spec["worker"] for spec in self.worker_specs if spec.get("worker")]
+        self._worker_key_set = frozenset(self.worker_keys)
         self.default_worker = default_worker or (self.worker_keys[0] if self.worker_keys else "")
         self.llm = inference_gateway
         self.planning_prompt = planning_prompt or self._default_planning_prompt()
+        # Worker specs and prompt are fixed after construction; render them once
+        self._worker_catalog_cache: Optional[str] = None
+        self._rendered_prompt = self.planning_prompt.replace("{worker_catalog}", self._build_worker_catalog())
         self.manager_worker_key = manager_worker_key
-        self.logger = get_logger()
+        self.logger = _planner_logger()
+        self._response_cache = _make_response_cache()
         self.fallback = StrategicDecomposerPlanner(
             worker_keys=self.worker_keys,
             default_worker=self.default_worker,
@@ -1814,18 +2589,18 @@ class ManagerScriptPlanner(BasePlanner):
             return response
         if isinstance(response, dict):
             try:
-                return ScriptPlan.model_validate(response)
+                return _SCRIPT_PLAN_ADAPTER.validate_python(response)
             except ValidationError:
                 try:
-                    return ScriptPlan.model_validate_json(json.dumps(response))
+                    return _SCRIPT_PLAN_ADAPTER.validate_json(_json_dumps(response))
                 except ValidationError:
                     return None
         text = response if isinstance(response, str) else str(response)
-        match = re.search(r"\{[\s\S]*\"script\"[\s\S]*\}", text)
-        if not match:
+        match = _json_object_containing(text, '"script"')
+        if match is None:
             return None
         try:
-            return ScriptPlan.model_validate_json(match.group(0))
+            return _SCRIPT_PLAN_ADAPTER.validate_json(match)
         except ValidationError as ve:
             self.logger.debug("ManagerScriptPlanner: script validation error %s", ve)
             return None
@@ -1855,9 +2630,6 @@ class ManagerScriptPlanner(BasePlanner):
         orchestrator_phase, goal_text = self._select_orchestrator_phase(task_description, history)
         previous_outputs = self._collect_previous_outputs(history)
 
-        worker_catalog = self._build_worker_catalog()
-        prompt = self.planning_prompt.replace("{worker_catalog}", worker_catalog)
-
         context_sections = [f"Director Goal: {goal_text}"]
         if orchestrator_phase:
             phase_name = orchestrator_phase.get("name")
@@ -1872,7 +2644,7 @@ class ManagerScriptPlanner(BasePlanner):
                 context_sections.append(f"Output {idx}:\n{output}")
 
         messages = [
-            {"role": "system", "content": prompt},
+            {"role": "system", "content": self._rendered_prompt},
             {
                 "role": "user",
                 "content": "\n\n".join(context_sections) + "\n\nReturn strict JSON with fields 'thought' and 'script'.",
@@ -1880,7 +2652,7 @@ class ManagerScriptPlanner(BasePlanner):
         ]
 
         self.logger.info("ManagerScriptPlanner invoking LLM for script generation (worker_key=%s)", self.manager_worker_key)
-        response = self.llm.invoke(messages)
+        response = _invoke_llm(self.llm, self._response_cache, messages)
         plan_model = self._parse_script_response(response)
         if not plan_model:
             self.logger.warning("ManagerScriptPlanner: unable to parse script response, falling back")
@@ -1889,7 +2661,7 @@ class ManagerScriptPlanner(BasePlanner):
         script_steps = [step.model_dump() for step in plan_model.script]
         script_steps = self._normalize_script_workers(script_steps)
         primary_worker = script_steps[0]["worker"] if script_steps else self.default_worker
-        if primary_worker not in self.worker_keys and self.worker_keys:
+        if primary_worker not in self._worker_key_set and self.worker_keys:
             primary_worker = self.default_worker or self.worker_keys[0]
 
         metadata = {
@@ -1909,6 +2681,10 @@ class ManagerScriptPlanner(BasePlanner):
             },
         )
 
+    async def aplan(self, task_description: str, history: List[Dict[str, Any]]) -> Union[Action, FinalResponse]:
+        """Awaitable ``plan``; runs in a worker thread like ``StrategicDecomposerPlanner.aplan``."""
+        return await asyncio.to_thread(self.plan, task_description, history)
+
     def _strip_guided_tool_args(self, steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove tool_name/args from guided steps so workers reason autonomously."""
         sanitized: List[Dict[str, Any]] = []
@@ -1931,27 +2707,30 @@ class ManagerScriptPlanner(BasePlanner):
             return steps
         normalized: List[Dict[str, Any]] = []
         fallback_worker = self.default_worker or (self.worker_keys[0] if self.worker_keys else "")
+        # (step number, unknown worker) pairs, reported in one warning after the loop
+        bad_steps: List[Tuple[int, Any]] = []
         for idx, step in enumerate(steps, 1):
             worker = step.get("worker")
-            if worker in self.worker_keys:
+            if worker in self._worker_key_set:
                 normalized.append(step)
                 continue
-            if not fallback_worker:
+            bad_steps.append((idx, worker))
+            if fallback_worker:
+                normalized.append({**step, "worker": fallback_worker})
+        if bad_steps and self.logger.isEnabledFor(logging.WARNING):
+            if fallback_worker:
                 self.logger.warning(
-                    "ManagerScriptPlanner: step %d references unknown worker '%s' and no fallback is available",
-                    idx,
-                    worker,
+                    "ManagerScriptPlanner: reassigned %d step(s) with unknown workers to fallback worker '%s': %s",
+                    len(bad_steps),
+                    fallback_worker,
+                    bad_steps,
+                )
+            else:
+                self.logger.warning(
+                    "ManagerScriptPlanner: dropped %d step(s) with unknown workers, no fallback is available: %s",
+                    len(bad_steps),
+                    bad_steps,
                 )
-                continue
-            fixed = dict(step)
-            fixed["worker"] = fallback_worker
-            self.logger.warning(
-                "ManagerScriptPlanner: step %d referenced unknown worker '%s'. Reassigning to fallback worker '%s'.",
-                idx,
-                worker,
-                fallback_worker,
-            )
-            normalized.append(fixed)
         return normalized
 
     def _select_orchestrator_phase(
@@ -1959,20 +2738,21 @@ class ManagerScriptPlanner(BasePlanner):
         fallback_task: str,
         history: List[Dict[str, Any]],
     ) -> Tuple[Optional[Dict[str, Any]], str]:
-        from ..services.request_context import get_from_context
-
         upstream = get_from_context("strategic_plan")
         if not upstream:
-            upstream = next((h.get("content") for h in reversed(history) if h.get("type") == "strategic_plan"), None)
+            upstream = _last_content_of_type(history, "strategic_plan")
 
-        plan_obj = upstream.get("plan") if isinstance(upstream, dict) else {}
+        if not isinstance(upstream, dict):
+            return None, fallback_task
+        plan_obj = upstream.get("plan")
         if not isinstance(plan_obj, dict):
-            plan_obj = upstream if isinstance(upstream, dict) else {}
-        phases_in = plan_obj.get("phases") if isinstance(plan_obj, dict) else []
+            plan_obj = upstream
+        phases_in = plan_obj.get("phases") or []
         orchestrator_phase = None
 
-        if self.manager_worker_key and isinstance(phases_in, list):
-            matching = [p for p in phases_in if str(p.get("worker", "")).strip() == self.manager_worker_key]
+        mk = self.manager_worker_key
+        if mk and isinstance(phases_in, list):
+            matching = [p for p in phases_in if str(p.get("worker", "")).strip() == mk]
             phase_index = get_from_context("orchestrator_phase_index")
             if matching:
                 if isinstance(phase_index, int) and 0 <= phase_index < len(matching):
@@ -1989,30 +2769,28 @@ class ManagerScriptPlanner(BasePlanner):
         synthesized_outputs: List[str] = []
         regular_outputs: List[str] = []
         for entry in reversed(history):
-            if not isinstance(entry, dict):
+            try:
+                entry_type = entry["type"]
+            except (TypeError, KeyError):
                 continue
-            entry_type = entry.get("type")
             if entry_type == SYNTHESIS:
-                content = entry.get("content", {})
-                if isinstance(content, dict):
-                    summary = content.get("synthesized_summary")
-                    if not summary:
-                        full_result = content.get("full_result", {})
-                        if isinstance(full_result, dict):
-                            summary = full_result.get("human_readable_summary") or full_result.get("summary")
-                    actual_data = content.get("actual_data") or content.get("payload")
-                    output_parts = []
-                    if summary:
-                        output_parts.append(summary)
-                    if actual_data:
-                        try:
-                            import json as _json
-                            output_parts.append(_json.dumps(actual_data, indent=2)[:5000])
-                        except Exception:
-                            output_parts.append(str(actual_data)[:5000])
-                    if output_parts:
-                        synthesized_outputs.append("\n\n".join(output_parts))
-            elif entry_type in {"final", "assistant_message", "manager_result"}:
+                content = entry.get("content")
+                if type(content) is not dict:
+                    continue
+                summary = content.get("synthesized_summary")
+                if not summary:
+                    full_result = content.get("full_result")
+                    if type(full_result) is dict:
+                        summary = full_result.get("human_readable_summary") or full_result.get("summary")
+                actual_data = content.get("actual_data") or content.get("payload")
+                output_parts = []
+                if summary:
+                    output_parts.append(summary)
+                if actual_data:
+                    output_parts.append(_json_preview(actual_data, 5000))
+                if output_parts:
+                    synthesized_outputs.append("\n\n".join(output_parts))
+            elif entry_type in _REGULAR_OUTPUT_TYPES:
                 content = entry.get("content", {})
                 if isinstance(content, dict):
                     summary = content.get("human_readable_summary") or content.get("summary")
@@ -2020,60 +2798,43 @@ class ManagerScriptPlanner(BasePlanner):
                         regular_outputs.append(summary)
                 elif isinstance(content, str):
                     regular_outputs.append(content)
+            else:
+                # Other entry types cannot change the counts checked below
+                continue
             if len(synthesized_outputs) >= 2:
                 break
             if not synthesized_outputs and len(regular_outputs) >= 3:
                 break
         return synthesized_outputs if synthesized_outputs else regular_outputs
 
+    def invalidate_catalog(self) -> None:
+        """Rebuild the worker catalog and system prompt after ``worker_specs`` changes."""
+        self._worker_catalog_cache = None
+        self._rendered_prompt = self.planning_prompt.replace("{worker_catalog}", self._build_worker_catalog())
+
     def _build_worker_catalog(self) -> str:
-        lines: List[str] = []
+        if self._worker_catalog_cache is not None:
+            return self._worker_catalog_cache
+        buf = StringIO()
+        write = buf.write
         for spec in self.worker_specs:
             worker = spec.get("worker")
             if not worker:
                 continue
-            lines.append(f"- {worker}: {spec.get('description', '').strip()}")
-            tools = spec.get("tools") or []
-            if tools:
-                tool_lines = []
-                for tool in tools:
-                    name = tool.get("name") or tool.get("tool_name")
-                    if not name:
-                        continue
-                    desc = tool.get("description", "")
-                    args = tool.get("args")
-                    if args:
-                        args_str = ", ".join(args) if isinstance(args, list) else str(args)
-                        tool_lines.append(f"    • {name}({args_str}): {desc}")
-                    else:
-                        tool_lines.append(f"    • {name}: {desc}")
-                if tool_lines:
-                    lines.extend(tool_lines)
-        return "\n".join(lines)
+            write(f"- {worker}: {spec.get('description', '').strip()}\n")
+            for tool in spec.get("tools") or ():
+                name = tool.get("name") or tool.get("tool_name")
+                if not name:
+                    continue
+                desc = tool.get("description", "")
+                args = tool.get("args")
+                if args:
+                    write(f"    • {name}({_format_tool_args(args)}): {desc}\n")
+                else:
+                    write(f"    • {name}: {desc}\n")
+        # Drop only the final line's newline, as "\n".join(lines) did
+        self._worker_catalog_cache = buf.getvalue()[:-1]
+        return self._worker_catalog_cache
 
     def _default_planning_prompt(self) -> str:
-        return (
-            "You are a tactical Power BI manager. Your director gives you one goal at a time.\n"
-            "You must respond with a STRICT JSON object containing a 'thought' string and a 'script' array.\n\n"
-            "Each script entry must include: name, worker (from the list below), tool_name (exact tool), args (object), "
-            "and MAY include execution_mode when needed.\n"
-            "Workers and their tools:\n{worker_catalog}\n\n"
-            "Rules:\n"
-            "1. Think like a programmer writing a script.\n"
-            "2. Ensure prerequisites are satisfied before any dependent tool (e.g., gather data before validation).\n"
-            "3. Keep the script minimal and ordered. No speculative or redundant calls.\n"
-            "4. Only use the tools listed for each worker.\n"
-            "5. Choose an execution mode per step:\n"
-            "   • 'direct' (default) when every argument is concrete and the worker can run it deterministically.\n"
-            "   • 'guided' when the worker must reason, fill placeholders, or iterate on freshly retrieved data. "
-            "Provide the best available hints in args, but expect the worker to adapt.\n"
-            "6. Never delegate planning blindly – if you set execution_mode='guided', explain why in the step notes.\n\n"
-            "Example output:\n"
-            "{\n"
-            "  \"thought\": \"List current relationships, then add the requested one.\",\n"
-            "  \"script\": [\n"
-            "    {\"name\": \"List relationships\", \"worker\": \"schema\", \"tool_name\": \"list_relationships\", \"args\": {}, \"execution_mode\": \"direct\"},\n"
-            "    {\"name\": \"Count columns per table\", \"worker\": \"schema\", \"tool_name\": \"list_columns\", \"args\": {\"table\": \"<table_from_previous>\"}, \"execution_mode\": \"guided\", \"notes\": \"Worker must iterate over each table returned earlier.\"}\n"
-            "  ]\n"
-            "}\n"
-        )
+        return _SCRIPT_PROMPT_PREFIX + "{worker_catalog}" + _SCRIPT_PROMPT_SUFFIX
@@ -5,6 +5,8 @@ These constants standardize the type keys used in memory entries across
 agents, managers, orchestrators, and synthesizers.
 """
 
+from typing import Final, FrozenSet, Tuple
+
 # Conversation types (turn-level, high-level messages)
 USER_MESSAGE = "user_message"
 ASSISTANT_MESSAGE = "assistant_message"
@@ -36,28 +38,38 @@ GLOBAL_OBSERVATION = "global_observation"
 DELEGATION = "delegation"
 
 # Type collections for filtering
+#
+# Collections are frozensets so membership tests are a single hash lookup.
+# The *_LIST tuples keep the declared order for callers that iterate.
 
 # Conversation layer: turn-level messages for orchestrator
-CONVERSATION_TYPES = [USER_MESSAGE, ASSISTANT_MESSAGE]
+CONVERSATION_TYPES_LIST: Final[Tuple[str, ...]] = (USER_MESSAGE, ASSISTANT_MESSAGE)
+CONVERSATION_TYPES: Final[FrozenSet[str]] = frozenset(CONVERSATION_TYPES_LIST)
 
 # Execution layer: task execution traces for workers
-EXECUTION_TRACE_TYPES = [TASK, ACTION, OBSERVATION, ERROR]
+EXECUTION_TRACE_TYPES_LIST: Final[Tuple[str, ...]] = (TASK, ACTION, OBSERVATION, ERROR)
+EXECUTION_TRACE_TYPES: Final[FrozenSet[str]] = frozenset(EXECUTION_TRACE_TYPES_LIST)
 
 # Completion layer: signals that indicate task completion
-COMPLETION_TYPES = [FINAL, SYNTHESIS]
+COMPLETION_TYPES_LIST: Final[Tuple[str, ...]] = (FINAL, SYNTHESIS)
+COMPLETION_TYPES: Final[FrozenSet[str]] = frozenset(COMPLETION_TYPES_LIST)
 
 # Turn markers: entries that mark the start of a new turn
-TURN_MARKERS = [TASK]
+TURN_MARKERS_LIST: Final[Tuple[str, ...]] = (TASK,)
+TURN_MARKERS: Final[FrozenSet[str]] = frozenset(TURN_MARKERS_LIST)
 
 # Planning layer: strategic planning context
-PLANNING_TYPES = [STRATEGIC_PLAN, SUGGESTED_PLAN, SCRIPT_PLAN, SCRIPT_INSTRUCTION]
+PLANNING_TYPES_LIST: Final[Tuple[str, ...]] = (STRATEGIC_PLAN, SUGGESTED_PLAN, SCRIPT_PLAN, SCRIPT_INSTRUCTION)
+PLANNING_TYPES: Final[FrozenSet[str]] = frozenset(PLANNING_TYPES_LIST)
 
 # Context layer: injected context
-CONTEXT_TYPES = [DIRECTOR_CONTEXT, INJECTED_CONTEXT]
+CONTEXT_TYPES_LIST: Final[Tuple[str, ...]] = (DIRECTOR_CONTEXT, INJECTED_CONTEXT)
+CONTEXT_TYPES: Final[FrozenSet[str]] = frozenset(CONTEXT_TYPES_LIST)
 
 # Global layer: cross-agent communication
-GLOBAL_TYPES = [GLOBAL_OBSERVATION, SYNTHESIS]
+GLOBAL_TYPES_LIST: Final[Tuple[str, ...]] = (GLOBAL_OBSERVATION, SYNTHESIS)
+GLOBAL_TYPES: Final[FrozenSet[str]] = frozenset(GLOBAL_TYPES_LIST)
 
 # Delegation layer: manager-worker communication
-DELEGATION_TYPES = [DELEGATION]
-
+DELEGATION_TYPES_LIST: Final[Tuple[str, ...]] = (DELEGATION,)
+DELEGATION_TYPES: Final[FrozenSet[str]] = frozenset(DELEGATION_TYPES_LIST)
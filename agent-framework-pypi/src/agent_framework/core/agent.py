@@ -12,7 +12,8 @@ import time
 import uuid
 import json
 
-from ..base import Action, FinalResponse, BasePlanner, BaseTool, BaseMemory, BaseProgressHandler
+from ..base import Action, BasePlanner, BaseTool, BaseMemory, BaseProgressHandler
+from ..responses import FinalResponse
 from .events import EventBus
 from .event_payloads import (
     build_action_executed_event,
@@ -462,7 +463,7 @@ class Agent:
                 human_readable_summary=result.get("human_readable_summary", message)
             )
         else:
-            final_response = FinalResponse(
+            final_response = FinalResponse.trusted(
                 operation="display_message",
                 payload={"message": message},
                 human_readable_summary=message
@@ -479,7 +480,7 @@ class Agent:
         """Create error response."""
         self.memory.add({"type": ERROR, "content": message})
         
-        error_response = FinalResponse(
+        error_response = FinalResponse.trusted(
             operation="display_message",
             payload={"message": message, "error": True, "stagnation": stagnation},
             human_readable_summary=message
@@ -900,15 +901,14 @@ class Agent:
                         try:
                             span.set_attribute("tool.name", tool.name)  # type: ignore[attr-defined]
                             # Capture structured input (args) as proper JSON
-                            import json as _json
                             import os
                             try:
-                                args_json = _json.dumps(kwargs, default=str)
+                                args_json = json.dumps(kwargs, default=str)
                                 span.set_attribute("tool.input.args_json", args_json)  # type: ignore[attr-defined]
                                 # Also add pretty version if enabled
                                 try:
                                     if os.getenv("PHOENIX_PRETTY_JSON", "false").lower() in {"1", "true", "yes"}:
-                                        args_pretty = _json.dumps(kwargs, indent=2, ensure_ascii=False, default=str)
+                                        args_pretty = json.dumps(kwargs, indent=2, ensure_ascii=False, default=str)
                                         max_chars = int(os.getenv("PHOENIX_MAX_ATTR_CHARS", "4000"))
                                         span.set_attribute("tool.input.args.pretty", args_pretty[:max_chars])  # type: ignore[attr-defined]
                                 except Exception:
@@ -938,12 +938,12 @@ class Agent:
                                     span.set_attribute("tool.output.result_summary", result_summary[:max_chars])  # type: ignore[attr-defined]
                                     # Also add full result as JSON if not too large
                                     try:
-                                        result_json = _json.dumps(result, default=str)
+                                        result_json = json.dumps(result, default=str)
                                         if len(result_json) <= max_chars:
                                             span.set_attribute("tool.output.result_json", result_json)  # type: ignore[attr-defined]
                                         # Pretty version if enabled
                                         if os.getenv("PHOENIX_PRETTY_JSON", "false").lower() in {"1", "true", "yes"}:
-                                            result_pretty = _json.dumps(result, indent=2, ensure_ascii=False, default=str)
+                                            result_pretty = json.dumps(result, indent=2, ensure_ascii=False, default=str)
                                             span.set_attribute("tool.output.result.pretty", result_pretty[:max_chars])  # type: ignore[attr-defined]
                                     except Exception:
                                         pass
@@ -990,8 +990,7 @@ class Agent:
                     if not is_error:
                         job_id = context.get("job_id")
                         if job_id:
-                            import json as _json
-                            sig = f"{tool.name}:{_json.dumps(kwargs, sort_keys=True, default=str)}"
+                            sig = f"{tool.name}:{json.dumps(kwargs, sort_keys=True, default=str)}"
                             from ..state.job_store import get_job_store
                             get_job_store().add_executed_action(str(job_id), sig)
                 except Exception:
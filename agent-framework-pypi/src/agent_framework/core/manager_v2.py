@@ -6,9 +6,12 @@ This version replaces all hardcoded behavior with configurable policies.
 
 from __future__ import annotations
 
+import json
+import re
 from typing import Any, Dict, List, Optional, Union
 
-from ..base import BasePlanner, BaseMemory, BaseProgressHandler, Action, FinalResponse, BaseTool, BaseJobStore
+from ..base import BasePlanner, BaseMemory, BaseProgressHandler, Action, BaseTool, BaseJobStore
+from ..responses import FinalResponse
 from .events import EventBus
 from .event_payloads import (
     build_action_executed_event,
@@ -689,14 +692,12 @@ Return a final_response JSON with your analysis."""
             elif "data" in payload:
                 data = payload["data"]
                 if isinstance(data, (list, dict)):
-                    import json
                     formatted += f"\nData: {json.dumps(data, indent=2)[:500]}"
                 else:
                     formatted += f"\nData: {str(data)[:500]}"
         
         # Fallback: format the whole result if no structured info
         if not formatted.strip():
-            import json
             try:
                 formatted = json.dumps(result, indent=2)[:1000]
             except Exception:
@@ -1573,7 +1574,7 @@ Return a final_response JSON with your analysis."""
             if progress_handler:
                 await progress_handler.on_event("action_executed", executed_data)
 
-            final_response = FinalResponse(
+            final_response = FinalResponse.trusted(
                 operation="display_message",
                 payload={"message": str(result)},
                 human_readable_summary=f"Executed {tool.name}, result: {str(result)[:100]}...",
@@ -1595,7 +1596,6 @@ Return a final_response JSON with your analysis."""
         if not self.synthesis_gateway:
             return None
         
-        import json
         from ..services.request_context import get_from_context
         
         strategic_plan = get_from_context("strategic_plan")
@@ -1650,7 +1650,6 @@ Return JSON with "final_response" containing:
         response = self.synthesis_gateway.invoke(messages)
         
         try:
-            import re
             match = re.search(r'\{[\s\S]*"final_response"[\s\S]*\}', response)
             if match:
                 parsed = json.loads(match.group(0))
@@ -1680,7 +1679,6 @@ Return JSON with "final_response" containing:
             return None
         
         try:
-            import json
             from ..services.request_context import get_from_context
             builder = self._ensure_context_builder()
 
@@ -8,7 +8,8 @@ for configurable behavior in the framework.
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Tuple
 
-from ..base import FinalResponse
+from ..constants import TASK
+from ..responses import FinalResponse
 
 
 class CompletionDetector(ABC):
@@ -231,7 +232,6 @@ class HistoryFilter(ABC):
         Returns:
             Index of last task entry, or -1 if not found
         """
-        from ..constants import TASK
         for i in range(len(history) - 1, -1, -1):
             if history[i].get("type") == TASK:
                 return i
@@ -4,8 +4,9 @@ Default policy implementations for Framework v2.
 These provide sensible defaults that can be configured via YAML.
 """
 
+import json
 from typing import Any, Dict, List, Optional, Tuple
-from ..base import FinalResponse
+from ..responses import FinalResponse
 from ..constants import TASK
 from .base import (
     CompletionDetector,
@@ -233,7 +234,6 @@ class DefaultLoopPreventionPolicy(LoopPreventionPolicy):
             obs_to_check = last_obs
             if isinstance(last_obs, str):
                 try:
-                    import json
                     obs_to_check = json.loads(last_obs)
                 except:
                     pass
@@ -299,7 +299,6 @@ class DefaultHITLPolicy(HITLPolicy):
         if job_id:
             try:
                 from ...state.job_store import get_job_store
-                import json
                 sig = f"{tool_name}:{json.dumps(tool_args, sort_keys=True, default=str)}"
                 if get_job_store().has_executed_action(str(job_id), sig):
                     return False
@@ -397,7 +396,7 @@ class DefaultCheckpointPolicy(CheckpointPolicy):
                 )
             )
         else:
-            return FinalResponse(
+            return FinalResponse.trusted(
                 operation="display_message",
                 payload={
                     "message": str(result),
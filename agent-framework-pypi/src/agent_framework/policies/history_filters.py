@@ -22,6 +22,9 @@ from ..constants import (
     EXECUTION_TRACE_TYPES,
 )
 
+# Entry types a worker sees from its current turn
+_WORKER_TRACE_TYPES = EXECUTION_TRACE_TYPES | {GLOBAL_OBSERVATION}
+
 
 class OrchestratorHistoryFilter(HistoryFilter):
     """High-level conversation summary for orchestrator.
@@ -134,7 +137,7 @@ class WorkerHistoryFilter(HistoryFilter):
         # Exclude completion signals (checked separately in completion detection)
         filtered = [
             e for e in current_turn
-            if e.get("type") in EXECUTION_TRACE_TYPES + [GLOBAL_OBSERVATION]
+            if e.get("type") in _WORKER_TRACE_TYPES
         ]
         
         return filtered
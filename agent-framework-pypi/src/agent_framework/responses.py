@@ -0,0 +1,70 @@
+"""Structured response models returned by planners and agents."""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation, field_validator
+
+
+class FinalResponse(BaseModel):
+    """
+    Represents a final, structured response to the user or application.
+    
+    This is returned when the agent has completed its task and needs to communicate
+    the result in a machine-readable format for frontend consumption.
+
+    This intentionally remains a pydantic model rather than a plain dataclass:
+    Agent/ManagerAgent serialize it with ``model_dump()`` and applications rely on
+    ``model_validate()`` / ``model_json_schema()`` at their JSON boundaries.
+
+    ``payload`` is treated as opaque: it is type-checked but not walked or copied,
+    so the instance holds the caller's dict and mutating it in place is safe.
+
+    The core schema build is deferred until first validation or serialization,
+    which keeps it off the ``import agent_framework`` path.
+    """
+    model_config = ConfigDict(
+        revalidate_instances="never",
+        validate_assignment=False,
+        defer_build=True,
+    )
+
+    operation: str = Field(
+        ..., 
+        description="The high-level operation the frontend should perform (e.g., 'display_message', 'update_file_tree', 'display_table', 'model_ops')."
+    )
+    payload: SkipValidation[Dict[str, Any]] = Field(
+        ..., 
+        description="A JSON object containing the data needed to execute the operation."
+    )
+    human_readable_summary: str = Field(
+        ..., 
+        description="A natural language summary of the result for display in a chat log."
+    )
+
+    @field_validator("payload")
+    @classmethod
+    def _payload_is_dict(cls, value: Any) -> Dict[str, Any]:
+        if not isinstance(value, dict):
+            raise ValueError("payload must be a dict")
+        return value
+
+    @classmethod
+    def trusted(
+        cls,
+        operation: str,
+        payload: Dict[str, Any],
+        human_readable_summary: str,
+    ) -> "FinalResponse":
+        """Build a FinalResponse from framework-generated values, skipping validation.
+
+        Only use this for values the framework produced itself (literal operations,
+        payload dicts built in code). Untrusted input such as LLM JSON or tool output
+        must still go through the constructor or ``model_validate``.
+        """
+        return cls.model_construct(
+            operation=operation,
+            payload=payload,
+            human_readable_summary=human_readable_summary,
+        )
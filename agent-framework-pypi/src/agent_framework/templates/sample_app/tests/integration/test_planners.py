@@ -13,6 +13,8 @@ Run with:
 """
 from __future__ import annotations
 
+import json
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock
 
@@ -175,3 +177,266 @@ class TestMemoryWithPlanner:
         assert isinstance(history, list)
         assert all(isinstance(m, dict) for m in history)
         assert all("role" in m and "content" in m for m in history)
+
+
+# =============================================================================
+# E. ChatPlanner Replay Tests
+# =============================================================================
+
+class TestChatPlannerReplay:
+    """Test ChatPlanner reuse of the previous reply for a repeated message."""
+
+    def test_repeated_message_replays_reply(self):
+        """A repeated user message should return the stored reply without an LLM call."""
+        from agent_framework.components.planners import ChatPlanner
+
+        gateway = MagicMock()
+        planner = ChatPlanner(inference_gateway=gateway, replay_cache=True)
+        history = [
+            {"type": "user_message", "content": "Hello"},
+            {"type": "assistant_message", "content": "Hi there!"},
+        ]
+
+        result = planner.plan("Hello", history)
+
+        assert result.payload["message"] == "Hi there!"
+        gateway.invoke.assert_not_called()
+
+    def test_different_message_calls_llm(self):
+        """A new user message should still go to the LLM."""
+        from agent_framework.components.planners import ChatPlanner
+
+        gateway = MagicMock()
+        gateway.invoke.return_value = "Fresh reply"
+        planner = ChatPlanner(inference_gateway=gateway, replay_cache=True)
+        history = [
+            {"type": "user_message", "content": "Hello"},
+            {"type": "assistant_message", "content": "Hi there!"},
+        ]
+
+        result = planner.plan("What's new?", history)
+
+        assert result.payload["message"] == "Fresh reply"
+        gateway.invoke.assert_called_once()
+
+
+# =============================================================================
+# F. JSON Extraction Tests
+# =============================================================================
+
+class TestJsonExtraction:
+    """Test the JSON object scanners used to parse LLM output."""
+
+    def test_braces_inside_strings_are_ignored(self):
+        """Braces inside string values should not end the object early."""
+        from agent_framework.components.planners import _slice_json_object
+
+        text = 'Plan: {"thought": "use {x} and }", "action": "a"} done'
+
+        assert _slice_json_object(text) == '{"thought": "use {x} and }", "action": "a"}'
+
+    def test_escaped_quotes_stay_inside_strings(self):
+        """An escaped quote should not close the string it appears in."""
+        from agent_framework.components.planners import _json_object_span
+
+        text = '{"a": "say \\"}\\" now", "b": {"c": 1}} trailing }'
+        span = _json_object_span(text)
+
+        assert span is not None
+        assert json.loads(text[span[0]:span[1]]) == {"a": 'say "}" now', "b": {"c": 1}}
+
+    def test_prose_around_object_is_dropped(self):
+        """Prose before and after the object, including later braces, is not sliced in."""
+        from agent_framework.components.planners import _json_object_containing
+
+        text = 'Sure! {"script": []} Let me know {if} you need more.'
+
+        assert _json_object_containing(text, '"script"') == '{"script": []}'
+
+    def test_object_containing_skips_earlier_objects(self):
+        """The first object holding the marker is returned, not the first object."""
+        from agent_framework.components.planners import _json_object_containing
+
+        text = '{"note": 1} then {"phases": [{"name": "p"}]}'
+
+        assert _json_object_containing(text, '"phases"') == '{"phases": [{"name": "p"}]}'
+
+    def test_object_containing_truncated_falls_back(self):
+        """Truncated output falls back to the first-to-last brace slice."""
+        from agent_framework.components.planners import _json_object_containing
+
+        text = '{"script": [{"name": "a"}'
+
+        assert _json_object_containing(text, '"script"') == '{"script": [{"name": "a"}'
+        assert _json_object_containing("no json here", '"script"') is None
+
+    def test_unbalanced_object_keeps_first_to_last_brace(self):
+        """Without a balanced object the first '{' to last '}' slice is returned."""
+        from agent_framework.components.planners import _slice_json_object
+
+        assert _slice_json_object('x {"a": {"b": 1} y') == '{"a": {"b": 1}'
+        assert _slice_json_object("no braces") is None
+
+    def test_extract_first_object_with_required_key_picks_nested(self):
+        """required_key skips objects without it and can return a nested object."""
+        from agent_framework.components.planners import _extract_first_json_object
+
+        text = 'Result: {"outer": {"worker": "schema"}, "other": 1}'
+
+        assert _extract_first_json_object(text, "worker") == {"worker": "schema"}
+        assert _extract_first_json_object(text) == {"outer": {"worker": "schema"}, "other": 1}
+        assert _extract_first_json_object(text, "missing") is None
+
+    def test_fenced_block_is_extracted(self, react_planner):
+        """A ```json fenced block is preferred over other braces in the text."""
+        text = 'Note {x}\n```json\n{"thought": "t", "action": "web_search", "args": {"query": "q"}}\n```'
+
+        json_str = react_planner._extract_json_from_markdown(text)
+
+        assert json.loads(json_str)["action"] == "web_search"
+
+    def test_fenced_block_plans_action(self, tool_descriptions):
+        """A fenced response with prose around it should yield the tool action."""
+        gateway = MagicMock()
+        gateway.invoke.return_value = (
+            'I will search.\n```json\n{"thought": "look it up {now}", "action": "web_search", '
+            '"args": {"query": "say \\"hi\\""}}\n```\nDone.'
+        )
+        planner = ReActPlanner(inference_gateway=gateway, tool_descriptions=tool_descriptions)
+
+        action = planner.plan("Search", [])
+
+        assert action.tool_name == "web_search"
+        assert action.tool_args["query"] == 'say "hi"'
+
+    def test_truncated_output_returns_parse_error(self, tool_descriptions):
+        """Truncated JSON should reach the parse-error feedback response."""
+        gateway = MagicMock()
+        gateway.invoke.return_value = 'Here you go: {"thought": "t", "action": "web_search", "args": {"query": "q"}'
+        planner = ReActPlanner(inference_gateway=gateway, tool_descriptions=tool_descriptions)
+
+        result = planner.plan("Search", [])
+
+        assert result.payload["parse_error"] is True
+        assert "JSON PARSE ERROR" in result.payload["message"]
+
+
+# =============================================================================
+# G. Concurrent Manager Planning Tests
+# =============================================================================
+
+class TestConcurrentManagerPlanning:
+    """Test aplan running manager planners concurrently with the caller's context."""
+
+    @staticmethod
+    def _strategic_plan():
+        return {
+            "phases": [
+                {"name": "Inspect", "worker": "pbi", "goals": "first goal"},
+                {"name": "Edit", "worker": "pbi", "goals": "second goal"},
+            ]
+        }
+
+    @pytest.mark.asyncio
+    async def test_gathered_aplan_sees_caller_context(self):
+        """Each gathered aplan should plan against its own caller's request context."""
+        import asyncio
+        from agent_framework.components.planners import StrategicDecomposerPlanner
+        from agent_framework.services.request_context import set_request_context
+
+        planner = StrategicDecomposerPlanner(worker_keys=["schema"], manager_worker_key="pbi")
+
+        async def plan_phase(index):
+            # Each gathered task runs in its own copy of the context
+            set_request_context({
+                "strategic_plan": self._strategic_plan(),
+                "orchestrator_phase_index": index,
+            })
+            return await planner.aplan("fallback task", [])
+
+        first, second = await asyncio.gather(plan_phase(0), plan_phase(1))
+
+        assert first.tool_args["original_task"] == "first goal"
+        assert second.tool_args["original_task"] == "second goal"
+
+    @pytest.mark.asyncio
+    async def test_script_planner_aplan_falls_back_with_context(self):
+        """ManagerScriptPlanner.aplan without an LLM should use the decomposer with the context."""
+        from agent_framework.components.planners import ManagerScriptPlanner
+        from agent_framework.services.request_context import clear_request_context, set_request_context
+
+        planner = ManagerScriptPlanner(
+            worker_specs=[{"worker": "schema", "description": "Schema worker"}],
+            manager_worker_key="pbi",
+        )
+        set_request_context({"strategic_plan": self._strategic_plan(), "orchestrator_phase_index": 1})
+        try:
+            action = await planner.aplan("fallback task", [])
+        finally:
+            clear_request_context()
+
+        assert action.tool_name == "schema"
+        assert action.tool_args["original_task"] == "second goal"
+
+
+# =============================================================================
+# H. ReAct History Rendering Tests
+# =============================================================================
+
+class TestReActHistoryRendering:
+    """Test reuse of rendered history entries between ReActPlanner calls."""
+
+    @staticmethod
+    def _history(payload):
+        return [
+            {"type": "task", "content": "Search"},
+            {"type": "action", "tool": "web_search", "args": {"query": "q"}},
+            {"type": "observation", "content": payload},
+        ]
+
+    def test_second_plan_reuses_renderings(self, monkeypatch, tool_descriptions):
+        """A second plan() over the same entries should not re-render them."""
+        from agent_framework.components.planners import _env_int
+
+        monkeypatch.setenv("AGENT_REACT_OBS_TRUNCATE_LEN", "50")
+        # Env settings are parsed once per process; re-read them for this planner
+        _env_int.cache_clear()
+        gateway = MagicMock()
+        gateway.invoke.return_value = '{"thought": "t", "action": "web_search", "args": {"query": "q"}}'
+        try:
+            planner = ReActPlanner(inference_gateway=gateway, tool_descriptions=tool_descriptions)
+        finally:
+            _env_int.cache_clear()
+        render_observation = planner._text_renderers["observation"]
+        calls = []
+
+        def counting_render(entry):
+            calls.append(entry)
+            return render_observation(entry)
+
+        planner._text_renderers["observation"] = counting_render
+        history = self._history("x" * 500)
+
+        planner.plan("Search", history)
+        planner.plan("Search", list(history))
+
+        assert len(calls) == 1
+        first_prompt, second_prompt = (c.args[0] for c in gateway.invoke.call_args_list)
+        assert first_prompt == second_prompt
+        assert "Observation: " + "x" * 50 + "... (truncated)" in first_prompt
+        assert "x" * 51 not in first_prompt
+
+    def test_cache_keeps_only_latest_window(self, tool_descriptions):
+        """Entries that left the rendered window should not stay cached."""
+        gateway = MagicMock()
+        gateway.invoke.return_value = '{"thought": "t", "action": "web_search", "args": {"query": "q"}}'
+        planner = ReActPlanner(inference_gateway=gateway, tool_descriptions=tool_descriptions)
+        old_history = self._history("old result")
+        new_history = self._history("new result")
+
+        planner.plan("Search", old_history)
+        planner.plan("Search", new_history)
+
+        cached_entries = [entry for entry, _ in planner._rendered_text.snapshot().values()]
+        assert all(any(entry is e for e in new_history) for entry in cached_entries)
+        assert not any(entry is e for e in old_history for entry in cached_entries)
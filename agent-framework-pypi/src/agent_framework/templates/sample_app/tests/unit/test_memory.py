@@ -107,6 +107,17 @@ class TestInMemoryMemory:
         assert len(history2) == 1
         assert history1[0]["content"] != history2[0]["content"]
 
+    def test_memory_methods_are_sync(self, in_memory):
+        """Agent loops call memory methods directly, so they must not be coroutines."""
+        import inspect
+
+        from agent_framework.base import BaseMemory
+
+        assert not inspect.iscoroutinefunction(BaseMemory.add)
+        assert not inspect.iscoroutinefunction(BaseMemory.get_history)
+        assert not inspect.iscoroutinefunction(in_memory.add)
+        assert not inspect.iscoroutinefunction(in_memory.get_history)
+
 
 # =============================================================================
 # B. SharedInMemoryMemory Tests
@@ -577,6 +588,68 @@ class TestMemoryPresets:
         assert "research_worker" in memory._subordinates
         assert "task_worker" in memory._subordinates
 
+    def test_shared_presets_reuse_instance_for_same_context(self):
+        """Worker/manager presets should return one instance per resolved context."""
+        from agent_framework.components.memory_presets import get_memory_preset
+
+        ctx = {"agent_name": "Manager", "namespace": "cache-job", "subordinates": ["worker-1"]}
+        assert get_memory_preset("manager", ctx) is get_memory_preset("manager", dict(ctx))
+        assert get_memory_preset("worker", ctx) is not get_memory_preset(
+            "worker", {**ctx, "namespace": "other-job"}
+        )
+
+    def test_standalone_preset_not_shared(self):
+        """Standalone preset must always create an isolated instance."""
+        from agent_framework.components.memory_presets import get_memory_preset
+
+        ctx = {"agent_name": "Solo"}
+        assert get_memory_preset("standalone", ctx) is not get_memory_preset("standalone", ctx)
+
+    def test_presets_registry_is_read_only(self):
+        """MEMORY_PRESETS must only change through register_preset."""
+        from agent_framework.components.memory_presets import MEMORY_PRESETS
+
+        with pytest.raises(TypeError):
+            MEMORY_PRESETS["custom"] = lambda ctx: None  # type: ignore[index]
+
+    def test_register_preset(self):
+        """register_preset should make a new preset available with its description."""
+        from agent_framework.components import memory_presets
+
+        sentinel = object()
+        memory_presets.register_preset("test_custom", lambda ctx: sentinel, "Custom preset")
+        try:
+            assert memory_presets.get_memory_preset("test_custom") is sentinel
+            assert memory_presets.describe_preset("test_custom") == "Custom preset"
+        finally:
+            memory_presets._MEMORY_PRESETS_RAW.pop("test_custom", None)
+            memory_presets._PRESET_DESCRIPTIONS_RAW.pop("test_custom", None)
+
+    def test_register_preset_replaces_shared_preset(self):
+        """A factory replacing "worker" should get the caller's full context on every lookup."""
+        from agent_framework.components import memory_presets
+
+        original = memory_presets.MEMORY_PRESETS["worker"]
+        seen = []
+
+        def factory(ctx):
+            seen.append(dict(ctx))
+            return object()
+
+        memory_presets.register_preset("worker", factory)
+        try:
+            first = memory_presets.get_memory_preset("worker", {"agent_name": "W", "max_messages": 5})
+            second = memory_presets.get_memory_preset("worker", {"agent_name": "W", "max_messages": 50})
+
+            assert first is not second
+            assert seen == [
+                {"agent_name": "W", "max_messages": 5},
+                {"agent_name": "W", "max_messages": 50},
+            ]
+        finally:
+            memory_presets._MEMORY_PRESETS_RAW["worker"] = original
+            memory_presets._get_cached_preset.cache_clear()
+
     def test_describe_preset(self):
         """Should return description for preset."""
         from agent_framework.components.memory_presets import describe_preset
@@ -598,3 +671,53 @@ class TestMemoryPresets:
         updates = worker2.get_global_updates()
         assert len(updates) == 1
         assert updates[0]["from"] == "worker1"
+
+
+# =============================================================================
+# H. Message Store Memory Tests
+# =============================================================================
+
+class _ListMessageStore:
+    """Minimal duck-typed message store backed by plain lists."""
+
+    def __init__(self):
+        self.conversation = [{"type": "user_message", "content": "Hi"}]
+        self.agents = {"manager": [{"type": "task", "content": "Plan"}]}
+        self.globals = [{"type": "global_observation", "content": "Shared"}]
+
+    def get_conversation_messages(self, location, limit=None):
+        return list(self.conversation)
+
+    def get_agent_messages(self, location, agent_key, limit=None):
+        return list(self.agents.get(agent_key, []))
+
+    def get_global_messages(self, location, limit=None):
+        return list(self.globals)
+
+
+class TestMessageStoreMemory:
+    """Test memories that read history from an external message store."""
+
+    @pytest.mark.parametrize("subordinates", [None, ["worker"]])
+    def test_subclass_get_history_override_runs(self, subordinates):
+        """A subclass override of get_history should run with or without subordinates."""
+        from agent_framework.components.message_store_memory import HierarchicalMessageStoreMemory
+
+        class CustomMemory(HierarchicalMessageStoreMemory):
+            def get_history(self):
+                return ["subclass override"]
+
+        store = _ListMessageStore()
+        store.get_team_messages = lambda location, keys, limit=None: []
+        memory = CustomMemory(store, "job", "manager", subordinates=subordinates)
+
+        assert memory.get_history() == ["subclass override"]
+
+    def test_store_without_team_support(self):
+        """A store without get_team_messages should work for a manager without subordinates."""
+        from agent_framework.components.message_store_memory import HierarchicalMessageStoreMemory
+
+        memory = HierarchicalMessageStoreMemory(_ListMessageStore(), "job", "manager")
+
+        assert [m["content"] for m in memory.get_history()] == ["Hi", "Plan", "Shared"]
+        assert [m["content"] for m in memory.iter_history()] == ["Hi", "Plan", "Shared"]
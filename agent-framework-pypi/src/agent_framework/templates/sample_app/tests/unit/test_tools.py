@@ -330,6 +330,15 @@ class TestToolSchemas:
             assert "properties" in json_schema, \
                 f"{tool.name} args_schema has no properties"
 
+    def test_args_json_schema_is_cached(self, all_tools):
+        """args_json_schema should match pydantic's schema and be built once per class."""
+        for tool in all_tools:
+            if not hasattr(tool, "args_json_schema"):
+                continue
+            cached = tool.args_json_schema()
+            assert cached == tool.args_schema.model_json_schema()
+            assert tool.args_json_schema() is cached
+
     def test_output_schema_is_pydantic(self, all_tools):
         """output_schema should be a Pydantic model with model_json_schema."""
         for tool in all_tools:
@@ -5,7 +5,7 @@ This ensures consistent formatting for frontend consumption.
 """
 
 from typing import Any, Dict, List
-from ..base import FinalResponse
+from ..responses import FinalResponse
 
 
 def convert_list_tool_result_to_display_table(